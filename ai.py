@@ -0,0 +1,685 @@
+"""Search-based AI opponent for God's Gauntlet.
+
+The search never touches a GameEngine. SearchState.from_game() copies the
+gameplay state it needs into a few small lists: per-player ability state,
+and hand counts by card. Cards picked this turn are kept apart because they
+cannot be used yet. Moves are applied with make() and taken back with
+unmake() from an undo stack, and a 64-bit Zobrist hash is kept up to date on
+every move.
+
+The pool order is hidden, so Search runs Monte Carlo tree search over
+determinizations. Each iteration shuffles the unseen part of the pool and
+descends by UCT, with one tree node per hash in a transposition table. It
+then plays a fast rollout to the horizon and backs up the change in score
+difference. An Apollo player sees the next card, so that draw is never
+reshuffled. The rules have no win condition, so the score counts what the
+simulator measures: cards used (Demeter's are enhanced), abilities spent,
+and a smaller value for cards still in hand.
+
+AIPlayer drives one seat. Natively the search runs in a daemon thread with
+a time budget. In the browser there are no threads, so poll() runs it in
+short slices between frames.
+
+    python ai.py --budget 0.5 --games 20
+"""
+import argparse
+import math
+import random
+import sys
+import threading
+import time
+
+from engine import (GameEngine, GameRandom, REGISTRY, SHRINE_IDS, SHRINE_NAMES, AVAILABLE_GODS, GOD_IDS,
+                    GOD_ABILITIES, GOD_COOLDOWNS, GOD_FLAGS, MAX_ACTIONS_PER_TURN)
+from registry import ABILITY_ACTIVE, ABILITY_CLONE, SEES_NEXT_SHRINE, ENHANCES_SHRINES, MAX_COOLDOWN
+
+PICK, USE, ABILITY, END = range(4)
+ACTION_NAMES = ("pick", "use", "ability", "end")
+
+#score weights; card values default to 1.0 and can be overridden per card name
+ABILITY_VALUE = 1.0
+HAND_VALUE = 0.25
+ENHANCED_BONUS = 1.5
+
+DEFAULT_BUDGET = 0.5
+#turn ends searched past the root
+DEFAULT_HORIZON = 4
+EXPLORATION = 1.5
+MAX_NODES = 200_000
+#iterations between deadline checks
+CHECK_EVERY = 32
+
+CARD_COUNT = len(SHRINE_NAMES)
+CARD_CODES = REGISTRY.shrine_card_ids
+FULL_POOL = REGISTRY.pool_cards
+#SHRINE_IDS index -> card code, padded so engine pool orders translate with bytes.translate
+POOL_CODES = FULL_POOL + bytes(256 - len(SHRINE_IDS))
+
+#counts above this wrap around in the hash; such hands only risk a rare transposition mix-up
+HASH_COUNTS = 64
+
+def _zobrist_keys(seed=0x5EED):
+    rng = GameRandom(seed)
+    key = rng.next_u64
+
+    def counts():
+        #a count of zero hashes to nothing, so empty slots never need toggling
+        return [0] + [key() for _ in range(HASH_COUNTS - 1)]
+
+    return {
+        "mover": key(),
+        "depth": [key() for _ in range(64)],
+        "actions": [key() for _ in range(MAX_ACTIONS_PER_TURN + 1)],
+        "ready": [0, key(), key()],
+        "counter": [None] + [[key() for _ in range(MAX_COOLDOWN + 1)] for _ in range(2)],
+        "clone": [0, key(), key()],
+        "usable": [None] + [[counts() for _ in range(CARD_COUNT)] for _ in range(2)],
+        "fresh": [counts() for _ in range(CARD_COUNT)]
+    }
+
+ZOBRIST = _zobrist_keys()
+Z_MOVER = ZOBRIST["mover"]
+Z_DEPTH = ZOBRIST["depth"]
+Z_ACTIONS = ZOBRIST["actions"]
+Z_READY = ZOBRIST["ready"]
+Z_COUNTER = ZOBRIST["counter"]
+Z_CLONE = ZOBRIST["clone"]
+Z_USABLE = ZOBRIST["usable"]
+Z_FRESH = ZOBRIST["fresh"]
+COUNT_MASK = HASH_COUNTS - 1
+
+def card_value_table(card_values=None):
+    card_values = card_values or {}
+    return [float(card_values.get(name, 1.0)) for name in SHRINE_NAMES]
+
+class SearchState:
+    """Compact gameplay state with make/unmake moves and an incremental Zobrist hash.
+
+    Player lists use slots 1 and 2 like GameEngine. fresh holds the mover's
+    cards picked this turn, which turn usable when the turn ends. score is
+    the value each player has gained since the root, from the weights at the
+    top of this module.
+    """
+    __slots__ = ("mover", "depth", "actions_left", "kinds", "cooldowns", "bonus", "values", "value_order",
+                 "ready", "counters", "clones", "usable", "usable_total", "fresh", "fresh_total",
+                 "pool", "pool_pos", "score", "hash", "undo", "rng")
+
+    def __init__(self, mover, kinds, cooldowns, values, rng):
+        self.mover = mover
+        self.depth = 0
+        self.actions_left = MAX_ACTIONS_PER_TURN
+        self.kinds = kinds
+        self.cooldowns = cooldowns
+        self.bonus = [1.0, 1.0, 1.0]
+        self.values = values
+        #USE always spends the most valuable usable card; with equal values it is the engine's first usable
+        self.value_order = sorted(range(CARD_COUNT), key=lambda code: -values[code])
+        self.ready = [0, 1, 1]
+        self.counters = [0, 0, 0]
+        self.clones = [0, 0, 0]
+        self.usable = [None, [0] * CARD_COUNT, [0] * CARD_COUNT]
+        self.usable_total = [0, 0, 0]
+        self.fresh = [0] * CARD_COUNT
+        self.fresh_total = 0
+        self.pool = bytearray(FULL_POOL)
+        self.pool_pos = 0
+        self.score = [0.0, 0.0, 0.0]
+        self.hash = 0
+        self.undo = []
+        self.rng = rng
+
+    @classmethod
+    def from_game(cls, game, actions_taken=0, card_values=None, rng=None):
+        """Copy the gameplay state of a GameEngine in the playing stage"""
+        gods = game.god_ids
+        kinds = [None] + [GOD_ABILITIES[gods[p]] for p in [1, 2]]
+        cooldowns = [None] + [GOD_COOLDOWNS[gods[p]] for p in [1, 2]]
+        state = cls(game.current_player, kinds, cooldowns, card_value_table(card_values), rng or random.Random())
+        state.bonus = [1.0] + [ENHANCED_BONUS if GOD_FLAGS[gods[p]] & ENHANCES_SHRINES else 1.0 for p in [1, 2]]
+        state.actions_left = max(0, MAX_ACTIONS_PER_TURN - actions_taken)
+        for p in [1, 2]:
+            state.ready[p] = int(game.god_ability_ready[p])
+            state.counters[p] = game.god_ability_counters[p] if not game.god_ability_ready[p] else 0
+            state.clones[p] = int(game.clones[p] is not None)
+            for sc in game.shrine_cards[p]:
+                code = CARD_CODES[sc.card]
+                if sc.acquired_turn < game.turn_number:
+                    state.usable[p][code] += 1
+                    state.usable_total[p] += 1
+                else:
+                    state.fresh[code] += 1
+                    state.fresh_total += 1
+        state.pool = bytearray(bytes(game.pool_order).translate(POOL_CODES))
+        state.pool_pos = game.pool_pos
+        state.hash = state.full_hash()
+        return state
+
+    def copy(self, rng=None):
+        """Independent copy without the undo history, e.g. to hand to a search thread"""
+        other = SearchState.__new__(SearchState)
+        other.mover = self.mover
+        other.depth = self.depth
+        other.actions_left = self.actions_left
+        other.kinds = self.kinds
+        other.cooldowns = self.cooldowns
+        other.bonus = self.bonus
+        other.values = self.values
+        other.value_order = self.value_order
+        other.ready = self.ready[:]
+        other.counters = self.counters[:]
+        other.clones = self.clones[:]
+        other.usable = [None, self.usable[1][:], self.usable[2][:]]
+        other.usable_total = self.usable_total[:]
+        other.fresh = self.fresh[:]
+        other.fresh_total = self.fresh_total
+        other.pool = bytearray(self.pool)
+        other.pool_pos = self.pool_pos
+        other.score = self.score[:]
+        other.hash = self.hash
+        other.undo = []
+        other.rng = rng or self.rng
+        return other
+
+    def full_hash(self):
+        """Hash computed from scratch; make() and unmake() keep self.hash equal to it"""
+        h = Z_DEPTH[self.depth] ^ Z_ACTIONS[self.actions_left]
+        if self.mover == 2:
+            h ^= Z_MOVER
+        for p in [1, 2]:
+            if self.ready[p]:
+                h ^= Z_READY[p]
+            if self.clones[p]:
+                h ^= Z_CLONE[p]
+            h ^= Z_COUNTER[p][self.counters[p]]
+            for code, count in enumerate(self.usable[p]):
+                h ^= Z_USABLE[p][code][count & COUNT_MASK]
+        for code, count in enumerate(self.fresh):
+            h ^= Z_FRESH[code][count & COUNT_MASK]
+        return h
+
+    def can_use_ability(self):
+        m = self.mover
+        kind = self.kinds[m]
+        if kind == ABILITY_ACTIVE:
+            return self.ready[m]
+        return kind == ABILITY_CLONE and not self.clones[m]
+
+    def legal_actions(self):
+        if not self.actions_left:
+            return (END,)
+        actions = [END, PICK]
+        if self.usable_total[self.mover]:
+            actions.append(USE)
+        if self.can_use_ability():
+            actions.append(ABILITY)
+        return actions
+
+    def _refill(self):
+        self.pool[:] = FULL_POOL
+        self.rng.shuffle(self.pool)
+        self.pool_pos = 0
+
+    def make(self, action):
+        m = self.mover
+        h = self.hash
+
+        if action == END:
+            self.undo.append((END, h, self.actions_left, self.ready[:], self.counters[:],
+                              self.fresh[:], self.fresh_total, self.usable[m][:], self.usable_total[m]))
+            ready = self.ready
+            counters = self.counters
+            for p in (1, 2):
+                if self.kinds[p] == ABILITY_ACTIVE and not ready[p]:
+                    counter = counters[p]
+                    h ^= Z_COUNTER[p][counter]
+                    counter += 1
+                    if counter >= self.cooldowns[p]:
+                        ready[p] = 1
+                        counter = 0
+                        h ^= Z_READY[p]
+                    counters[p] = counter
+                    h ^= Z_COUNTER[p][counter]
+
+            if self.fresh_total:
+                fresh = self.fresh
+                usable = self.usable[m]
+                z_usable = Z_USABLE[m]
+                for code in range(CARD_COUNT):
+                    count = fresh[code]
+                    if count:
+                        old = usable[code]
+                        h ^= z_usable[code][old & COUNT_MASK] ^ z_usable[code][(old + count) & COUNT_MASK]
+                        h ^= Z_FRESH[code][count & COUNT_MASK]
+                        usable[code] = old + count
+                        fresh[code] = 0
+                self.usable_total[m] += self.fresh_total
+                self.fresh_total = 0
+
+            depth = self.depth
+            h ^= Z_MOVER ^ Z_DEPTH[depth] ^ Z_DEPTH[depth + 1] ^ Z_ACTIONS[self.actions_left] ^ Z_ACTIONS[MAX_ACTIONS_PER_TURN]
+            self.depth = depth + 1
+            self.actions_left = MAX_ACTIONS_PER_TURN
+            self.mover = 3 - m
+            self.hash = h
+            return
+
+        score = self.score
+        left = self.actions_left
+        h ^= Z_ACTIONS[left] ^ Z_ACTIONS[left - 1]
+        self.actions_left = left - 1
+
+        if action == PICK:
+            pos = self.pool_pos
+            old_pool = None
+            if pos == len(self.pool):
+                old_pool = bytes(self.pool)
+                self._refill()
+                pos = 0
+            code = self.pool[pos]
+            self.pool_pos = pos + 1
+            self.undo.append((PICK, self.hash, score[m], code, pos, old_pool))
+            count = self.fresh[code]
+            h ^= Z_FRESH[code][count & COUNT_MASK] ^ Z_FRESH[code][(count + 1) & COUNT_MASK]
+            self.fresh[code] = count + 1
+            self.fresh_total += 1
+            score[m] += HAND_VALUE * self.values[code]
+
+        elif action == USE:
+            usable = self.usable[m]
+            for code in self.value_order:
+                if usable[code]:
+                    break
+            self.undo.append((USE, self.hash, score[m], code))
+            count = usable[code]
+            h ^= Z_USABLE[m][code][count & COUNT_MASK] ^ Z_USABLE[m][code][(count - 1) & COUNT_MASK]
+            usable[code] = count - 1
+            self.usable_total[m] -= 1
+            value = self.values[code]
+            score[m] += value * self.bonus[m] - HAND_VALUE * value
+
+        else:
+            self.undo.append((ABILITY, self.hash, score[m], 0))
+            if self.kinds[m] == ABILITY_ACTIVE:
+                self.ready[m] = 0
+                h ^= Z_READY[m]
+            else:
+                self.clones[m] = 1
+                h ^= Z_CLONE[m]
+            score[m] += ABILITY_VALUE
+
+        self.hash = h
+
+    def unmake(self):
+        record = self.undo.pop()
+        action = record[0]
+        self.hash = record[1]
+
+        if action == END:
+            m = 3 - self.mover
+            self.mover = m
+            self.depth -= 1
+            (_, _, self.actions_left, self.ready, self.counters,
+             self.fresh, self.fresh_total, self.usable[m], self.usable_total[m]) = record
+            return
+
+        m = self.mover
+        self.score[m] = record[2]
+        self.actions_left += 1
+        if action == PICK:
+            code, pos, old_pool = record[3], record[4], record[5]
+            if old_pool is not None:
+                self.pool[:] = old_pool
+                pos = len(old_pool)
+            self.pool_pos = pos
+            self.fresh[code] -= 1
+            self.fresh_total -= 1
+        elif action == USE:
+            self.usable[m][record[3]] += 1
+            self.usable_total[m] += 1
+        elif self.kinds[m] == ABILITY_ACTIVE:
+            self.ready[m] = 1
+        else:
+            self.clones[m] = 0
+
+class Search:
+    """Determinized UCT search with a transposition table, resumable in slices.
+
+    Values are changes in (root player's score - opponent's score) from a
+    node to the horizon, so two paths into the same position share
+    statistics no matter what they scored on the way there.
+    """
+
+    def __init__(self, state, horizon=DEFAULT_HORIZON, known_draws=0, exploration=EXPLORATION,
+                 max_nodes=MAX_NODES):
+        self.state = state
+        self.player = state.mover
+        self.horizon = horizon
+        #leading pool cards the searching player can see (Apollo's sight) and so never reshuffles
+        self.known_draws = known_draws
+        self.exploration = exploration
+        self.max_nodes = max_nodes
+        #hash -> [visits, {action: [visits, total value]}]
+        self.table = {}
+        self.iterations = 0
+        self.moves = 0
+        self.elapsed = 0.0
+        self.stopped = False
+
+    def run(self, seconds):
+        """Search for about seconds, or until stop() is called from another thread"""
+        started = time.perf_counter()
+        deadline = started + seconds
+        iterate = self._iterate
+        sleep = time.sleep
+        while not self.stopped:
+            for _ in range(CHECK_EVERY):
+                iterate()
+            self.iterations += CHECK_EVERY
+            if time.perf_counter() >= deadline:
+                break
+            #hand the GIL over between batches so a render thread never waits a whole switch interval
+            sleep(0)
+        self.elapsed += time.perf_counter() - started
+
+    def stop(self):
+        self.stopped = True
+
+    def _iterate(self):
+        state = self.state
+        table = self.table
+        player = self.player
+        other = 3 - player
+        score = state.score
+        rng = state.rng
+        random_ = rng.random
+        horizon = self.horizon
+        exploration = self.exploration
+        log = math.log
+        sqrt = math.sqrt
+
+        #determinize: the unseen part of the pool gets a fresh order every iteration
+        start = state.pool_pos + self.known_draws
+        pool = state.pool
+        for i in range(len(pool) - 1, start, -1):
+            j = start + int(random_() * (i - start + 1))
+            pool[i], pool[j] = pool[j], pool[i]
+
+        path = []
+        made = 0
+        leaf = None
+        while state.depth < horizon:
+            node = table.get(state.hash)
+            if node is None:
+                if len(table) >= self.max_nodes:
+                    table.clear()
+                leaf = table[state.hash] = [0, {}]
+                break
+
+            edges = node[1]
+            sign = 1.0 if state.mover == player else -1.0
+            log_visits = log(node[0] + 1)
+            best = None
+            best_edge = None
+            best_score = -1e300
+            for action in state.legal_actions():
+                edge = edges.get(action)
+                if edge is None:
+                    best = action
+                    best_edge = edges[action] = [0, 0.0]
+                    break
+                value = sign * edge[1] / edge[0] + exploration * sqrt(log_visits / edge[0])
+                if value > best_score:
+                    best, best_edge, best_score = action, edge, value
+
+            path.append((node, best_edge, score[player] - score[other]))
+            state.make(best)
+            made += 1
+
+        #rollout: spend the ability and usable cards, sometimes pick, then end the turn
+        make = state.make
+        while state.depth < horizon:
+            action = END
+            if state.actions_left:
+                if state.can_use_ability() and random_() < 0.9:
+                    action = ABILITY
+                elif state.usable_total[state.mover] and random_() < 0.8:
+                    action = USE
+                elif random_() < 0.5:
+                    action = PICK
+            make(action)
+            made += 1
+
+        final = score[player] - score[other]
+        if leaf is not None:
+            leaf[0] += 1
+        for visited, edge, before in path:
+            visited[0] += 1
+            edge[0] += 1
+            edge[1] += final - before
+
+        unmake = state.unmake
+        for _ in range(made):
+            unmake()
+        self.moves += made
+
+    def root_edges(self):
+        node = self.table.get(self.state.hash)
+        return node[1] if node else {}
+
+    def best_action(self):
+        """Most visited root move; END when the search has not run"""
+        edges = self.root_edges()
+        if not edges:
+            return END
+        return max(edges, key=lambda action: edges[action][0])
+
+    def stats(self):
+        elapsed = self.elapsed or 1e-9
+        return {"iterations": self.iterations, "moves": self.moves, "nodes": len(self.table),
+                "elapsed": round(self.elapsed, 4), "moves_per_second": round(self.moves / elapsed)}
+
+def best_card_index(game, player, card_values=None):
+    """Index of the usable card USE spends: highest value, earliest in hand on ties"""
+    values = card_value_table(card_values)
+    best = None
+    for i, sc in enumerate(game.shrine_cards[player]):
+        if sc.acquired_turn < game.turn_number:
+            if best is None or values[CARD_CODES[sc.card]] > values[CARD_CODES[game.shrine_cards[player][best].card]]:
+                best = i
+    return best
+
+def apply_action(game, action, card_values=None):
+    """Issue one search move against a GameEngine"""
+    if action == PICK:
+        game.pick_shrine()
+    elif action == USE:
+        p = game.current_player
+        index = best_card_index(game, p, card_values)
+        if index is not None:
+            game.select_shrine(p, index)
+            game.use_shrine_card()
+    elif action == ABILITY:
+        game.use_god_ability()
+    else:
+        game.end_turn()
+
+def choose_apollo_shrine(card_values=None):
+    values = card_value_table(card_values)
+    return SHRINE_NAMES[max(range(CARD_COUNT), key=lambda code: values[code])]
+
+class AIPlayer:
+    """Plays one seat of a GameEngine, one move per finished search.
+
+    think() snapshots the game and starts searching; poll() returns the
+    chosen action once the budget is spent and None until then. With
+    threaded=False, poll() runs the search itself for slice_seconds at a
+    time, which keeps a single-threaded loop responsive.
+    """
+
+    def __init__(self, player, budget=DEFAULT_BUDGET, horizon=DEFAULT_HORIZON, threaded=True,
+                 card_values=None, seed=None):
+        self.player = player
+        self.budget = budget
+        self.horizon = horizon
+        self.threaded = threaded
+        self.card_values = card_values
+        self.rng = random.Random(seed)
+        self.search = None
+        self.thread = None
+        self.result = None
+        self.remaining = 0.0
+        self.turn = None
+        self.actions_taken = 0
+        self.last_stats = None
+
+    def is_turn(self, game):
+        return game.game_stage == "playing" and not game.game_ended and game.current_player == self.player
+
+    def choose_god(self):
+        return self.rng.choice(AVAILABLE_GODS)
+
+    def choose_apollo_shrine(self):
+        return choose_apollo_shrine(self.card_values)
+
+    def think(self, game):
+        """Start searching the current position unless a search is already running"""
+        if self.search is not None:
+            return
+        if self.turn != game.turn_number:
+            self.turn = game.turn_number
+            self.actions_taken = 0
+        state = SearchState.from_game(game, self.actions_taken, self.card_values,
+                                      random.Random(self.rng.getrandbits(64)))
+        known = 1 if GOD_FLAGS[game.god_ids[self.player]] & SEES_NEXT_SHRINE else 0
+        self.search = Search(state, self.horizon, known_draws=known)
+        self.result = None
+        if state.legal_actions() == (END,):
+            self.result = END
+        elif self.threaded:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+        else:
+            self.remaining = self.budget
+
+    def _run(self):
+        self.search.run(self.budget)
+        self.result = self.search.best_action()
+
+    def poll(self, slice_seconds=0.004):
+        """The chosen action once the search is done, else None"""
+        search = self.search
+        if search is None:
+            return None
+        if self.result is None and not self.threaded:
+            step = min(slice_seconds, self.remaining)
+            search.run(step)
+            self.remaining -= step
+            if self.remaining <= 0:
+                self.result = search.best_action()
+        if self.result is None:
+            return None
+
+        action = self.result
+        self.last_stats = search.stats()
+        self.search = None
+        self.thread = None
+        self.result = None
+        return action
+
+    def play(self, game, action):
+        """Apply action to game and count it against this turn's action cap"""
+        if action != END:
+            self.actions_taken += 1
+        apply_action(game, action, self.card_values)
+
+    def cancel(self):
+        """Abandon any running search, e.g. when the match is reset"""
+        if self.search is not None:
+            self.search.stop()
+        if self.thread is not None:
+            self.thread.join()
+        self.search = None
+        self.thread = None
+        self.result = None
+        self.turn = None
+
+def play_match(ai, opponent, god_1, god_2, rng, max_turns):
+    """Play one match of ai against a simulate.py policy and return (score difference, search stats)"""
+    game = GameEngine(verbose=False, seed=rng.next_u64())
+    gained = [0.0, 0.0, 0.0]
+    bonus = [1.0] + [ENHANCED_BONUS if GOD_FLAGS[GOD_IDS[god]] & ENHANCES_SHRINES else 1.0 for god in (god_1, god_2)]
+
+    def record(event, data):
+        if event == "shrine_used":
+            gained[data["player"]] += bonus[data["player"]]
+        elif event in ("ability_used", "clone_spawned"):
+            gained[data["player"]] += ABILITY_VALUE
+
+    game.subscribe(record)
+    game.select_god(1, god_1)
+    game.select_god(2, god_2)
+    while game.game_stage == "apollo_selection":
+        game.select_apollo_shrine(game.current_selection_player, choose_apollo_shrine())
+
+    moves = 0
+    elapsed = 0.0
+    while game.turn_number <= max_turns:
+        if game.current_player == ai.player:
+            ai.think(game)
+            action = None
+            while action is None:
+                if ai.thread is not None:
+                    ai.thread.join()
+                action = ai.poll()
+            moves += ai.last_stats["moves"]
+            elapsed += ai.last_stats["elapsed"]
+            ai.play(game, action)
+        else:
+            for _ in range(MAX_ACTIONS_PER_TURN):
+                choice = opponent(game, rng)
+                if choice == "end":
+                    break
+                elif choice == "pick":
+                    game.pick_shrine()
+                elif choice == "use":
+                    game.use_shrine_card()
+                elif choice == "ability":
+                    game.use_god_ability()
+            game.end_turn()
+
+    hand = [0.0] + [HAND_VALUE * len(game.shrine_cards[p]) for p in [1, 2]]
+    other = 3 - ai.player
+    return gained[ai.player] + hand[ai.player] - gained[other] - hand[other], moves, elapsed
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Play the search AI against a simulator policy")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="seconds of search per move")
+    parser.add_argument("--horizon", type=int, default=DEFAULT_HORIZON, help="turn ends searched ahead")
+    parser.add_argument("--opponent", default="greedy", help="simulate.py policy name or module:function")
+    parser.add_argument("--max-turns", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    from simulate import resolve_policy
+
+    args = parse_args()
+    opponent = resolve_policy(args.opponent)
+    rng = GameRandom(args.seed)
+    total_diff = 0.0
+    total_moves = 0
+    total_elapsed = 0.0
+    for index in range(args.games):
+        player = 1 + index % 2
+        ai = AIPlayer(player, args.budget, args.horizon, seed=args.seed + index)
+        god_1 = rng.choice(AVAILABLE_GODS)
+        god_2 = rng.choice(AVAILABLE_GODS)
+        diff, moves, elapsed = play_match(ai, opponent, god_1, god_2, rng, args.max_turns)
+        total_diff += diff
+        total_moves += moves
+        total_elapsed += elapsed
+        print(f"game {index + 1}: AI as player {player} ({god_1 if player == 1 else god_2}) "
+              f"score difference {diff:+.2f}", file=sys.stderr)
+    print(f"mean score difference {total_diff / max(args.games, 1):+.3f} vs {args.opponent}; "
+          f"{total_moves / max(total_elapsed, 1e-9):.0f} simulated moves/s", file=sys.stderr)
@@ -0,0 +1,602 @@
+"""Lockstep NumPy engine that plays many two-player matches at once.
+
+BatchEngine holds N matches in the playing stage as arrays. Per-game rows
+hold the current player, turn number and pool pointer. Per-player columns
+hold ability timers, clone spawn turns and selections. Hands are fixed-width
+(game, player, slot) matrices of card IDs and acquired turns, widened when
+a hand fills up. pick(), select(), use(), ability() and end_turn() apply
+GameEngine's rules to a subset of games given as an index array. A policy
+therefore picks one action per game, and each action runs once over its
+subset.
+
+Pool orders come from a RefillSource, which hands out the same
+permutation_batch rows as simulate.refill_stream in request order. With
+record_refills, every game keeps the orders it consumed. Policies draw from
+a BatchRandom that holds one GameRandom stream per game. check() replays the
+orders and streams through the scalar GameEngine and simulate's policies.
+It then compares the two engines state by state.
+
+    python batch.py check --games 500 --turns 40
+    python batch.py bench --games 20000
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from engine import (REGISTRY, GameRandom, SHRINE_COUNT, SHRINE_NAMES, AVAILABLE_GODS, GOD_IDS, GOD_ABILITIES, GOD_COOLDOWNS,
+                    GOD_FLAGS, GOD_CLONE_LIFETIMES, MAX_ACTIONS_PER_TURN, ABILITY_ACTIVE, ABILITY_CLONE,
+                    CHOOSES_STARTING_SHRINE, STARTING_SHRINE, permutation_batch)
+
+#same order as simulate.ACTIONS
+PICK, SELECT, USE, ABILITY, END = range(5)
+REFILL_BLOCK = 4096
+
+ABILITY_KINDS = np.array(GOD_ABILITIES, dtype=np.int8)
+COOLDOWNS = np.array(GOD_COOLDOWNS, dtype=np.int32)
+CLONE_LIFETIMES = np.array(GOD_CLONE_LIFETIMES, dtype=np.int32)
+FLAGS = np.array(GOD_FLAGS, dtype=np.int32)
+#pool slot -> card ID
+POOL_CARDS = np.frombuffer(REGISTRY.pool_cards, dtype=np.uint8)
+NO_CLONE = -1
+NO_SELECTION = -1
+
+class RefillSource:
+    """Endless pool orders, generated REFILL_BLOCK rows at a time and handed out in request order"""
+
+    def __init__(self, seed, block=REFILL_BLOCK):
+        self.seed = seed
+        self.block = block
+        self.blocks = 0
+        self.rows = np.empty((0, SHRINE_COUNT), dtype=np.uint8)
+        self.pos = 0
+
+    def take(self, count):
+        parts = []
+        while count:
+            if self.pos == len(self.rows):
+                self.rows = permutation_batch([self.seed, self.blocks], self.block)
+                self.blocks += 1
+                self.pos = 0
+            n = min(count, len(self.rows) - self.pos)
+            parts.append(self.rows[self.pos:self.pos + n])
+            self.pos += n
+            count -= n
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+class BatchRandom:
+    """One GameRandom stream per game, advanced for a subset of games at a time.
+
+    forked(seed, count) starts game g where GameRandom(seed).fork(g) starts,
+    so a scalar game can replay the exact draws of its batch row.
+    """
+    GAMMA = np.uint64(0x9E3779B97F4A7C15)
+    MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+    MIX_2 = np.uint64(0x94D049BB133111EB)
+    FORK = np.uint64(0xD1B54A32D192ED03)
+
+    def __init__(self, states):
+        self.state = np.asarray(states, dtype=np.uint64)
+
+    @classmethod
+    def forked(cls, seed, count):
+        streams = cls(np.uint64(GameRandom(seed).state) ^ (np.arange(count, dtype=np.uint64) * cls.FORK))
+        return cls(streams.next_u64(np.arange(count)))
+
+    def next_u64(self, rows):
+        z = self.state[rows] + self.GAMMA
+        self.state[rows] = z
+        z = (z ^ (z >> np.uint64(30))) * self.MIX_1
+        z = (z ^ (z >> np.uint64(27))) * self.MIX_2
+        return z ^ (z >> np.uint64(31))
+
+    def randbelow(self, rows, n):
+        """GameRandom.randbelow for n below 2**31: the top 64 bits of the 128-bit product, from 32-bit halves"""
+        z = self.next_u64(rows)
+        n = np.asarray(n, dtype=np.uint64)
+        shift = np.uint64(32)
+        high = (z >> shift) * n + (((z & np.uint64(0xFFFFFFFF)) * n) >> shift)
+        return (high >> shift).astype(np.int64)
+
+    def random(self, rows):
+        return (self.next_u64(rows) >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+class BatchEngine:
+    """N matches as arrays; player p of the rules is column p - 1.
+
+    Game rows passed to the actions must be unique. Counters for the
+    simulator's statistics are kept per player column (and per card for
+    uses) and added into a MatchStats by collect().
+    """
+
+    def __init__(self, gods, refills, hand_capacity=8, record_refills=False):
+        gods = np.asarray(gods, dtype=np.int32)
+        n = len(gods)
+        self.size = n
+        self.gods = gods
+        self.kinds = ABILITY_KINDS[gods]
+        self.cooldowns = COOLDOWNS[gods]
+        self.lifetimes = CLONE_LIFETIMES[gods]
+        #end_turn skips clone expiry when no clone in the batch can expire
+        self.clones_expire = bool((self.lifetimes > 0).any())
+        self.refills = refills
+        #(rows, orders) per shuffle; refill_orders() regroups them by game
+        self.refill_log = [] if record_refills else None
+
+        self.current = np.zeros(n, dtype=np.int64)
+        self.turn = np.ones(n, dtype=np.int32)
+        self.ready = np.ones((n, 2), dtype=bool)
+        self.ready_turn = np.zeros((n, 2), dtype=np.int32)
+        self.clone_turn = np.full((n, 2), NO_CLONE, dtype=np.int32)
+        self.selected = np.full((n, 2), NO_SELECTION, dtype=np.int32)
+        self.pool = np.empty((n, SHRINE_COUNT), dtype=np.uint8)
+        self.pool_pos = np.zeros(n, dtype=np.int32)
+        self.hand_card = np.zeros((n, 2, hand_capacity), dtype=np.uint8)
+        self.hand_turn = np.zeros((n, 2, hand_capacity), dtype=np.int32)
+        self.hand_len = np.zeros((n, 2), dtype=np.int32)
+
+        self.stat_refills = 0
+        self.stat_picked = 0
+        self.stat_used = np.zeros(2, dtype=np.int64)
+        self.stat_abilities = np.zeros(2, dtype=np.int64)
+        self.stat_card_uses = np.zeros(len(SHRINE_NAMES), dtype=np.int64)
+
+        #the constructor's shuffle, like GameEngine._reset; not counted as a refill
+        self._shuffle(np.arange(n))
+
+    def _shuffle(self, rows):
+        if not len(rows):
+            return
+        orders = self.refills.take(len(rows))
+        self.pool[rows] = orders
+        self.pool_pos[rows] = 0
+        if self.refill_log is not None:
+            self.refill_log.append((rows.copy(), orders.copy()))
+
+    def refill_orders(self):
+        """Per game, the pool orders it consumed oldest first, as GameEngine's refill_orders"""
+        rows = np.concatenate([rows for rows, orders in self.refill_log])
+        orders = np.concatenate([orders for rows, orders in self.refill_log])
+        by_game = np.argsort(rows, kind="stable")
+        bounds = np.searchsorted(rows[by_game], np.arange(1, self.size))
+        return [[bytes(order) for order in group] for group in np.split(orders[by_game], bounds)]
+
+    def _refill_empty(self, rows):
+        empty = rows[self.pool_pos[rows] == SHRINE_COUNT]
+        self._shuffle(empty)
+        self.stat_refills += len(empty)
+
+    def _append(self, rows, players, cards, turns):
+        lengths = self.hand_len[rows, players]
+        if len(lengths) and lengths.max() >= self.hand_card.shape[2]:
+            self._grow()
+        self.hand_card[rows, players, lengths] = cards
+        self.hand_turn[rows, players, lengths] = turns
+        self.hand_len[rows, players] = lengths + 1
+
+    def _grow(self):
+        pad = ((0, 0), (0, 0), (0, self.hand_card.shape[2]))
+        self.hand_card = np.pad(self.hand_card, pad)
+        self.hand_turn = np.pad(self.hand_turn, pad)
+
+    def _remove(self, rows, players, indexes):
+        """Pop one card per game, shifting later cards down like list.pop"""
+        #only the slots up to the longest of these hands hold cards
+        width = int(self.hand_len[rows, players].max(initial=0))
+        shifting = np.arange(width - 1) >= indexes[:, None]
+        cards = self.hand_card[rows, players, :width]
+        removed = cards[np.arange(len(rows)), indexes]
+        for hand, values in ((self.hand_card, cards), (self.hand_turn, self.hand_turn[rows, players, :width])):
+            values[:, :-1] = np.where(shifting, values[:, 1:], values[:, :-1])
+            hand[rows, players, :width] = values
+        self.hand_len[rows, players] -= 1
+        return removed
+
+    def start(self, apollo_cards=None):
+        """Hand out starting cards as select_god, select_apollo_shrine and _start_game do.
+
+        apollo_cards is an (N, 2) array of the card ID each Apollo-like
+        player chooses; other entries are ignored.
+        """
+        rows = np.arange(self.size)
+        flags = FLAGS[self.gods]
+        for column in (0, 1):
+            choosing = rows[flags[:, column] & CHOOSES_STARTING_SHRINE != 0]
+            if not len(choosing):
+                continue
+            wanted = np.asarray(apollo_cards)[choosing, column]
+            positions = self.pool_pos[choosing]
+            cards = POOL_CARDS[self.pool[choosing]]
+            match = (cards == wanted[:, None]) & (np.arange(SHRINE_COUNT) >= positions[:, None])
+            #the card joins the hand even if no copy is left in the pool, which then stays as it is
+            present = match.any(axis=1)
+            swap, found, positions = choosing[present], np.argmax(match[present], axis=1), positions[present]
+            picked = self.pool[swap, found]
+            self.pool[swap, found] = self.pool[swap, positions]
+            self.pool[swap, positions] = picked
+            self.pool_pos[swap] += 1
+            self._append(choosing, np.full(len(choosing), column), wanted, 0)
+
+        for column in (0, 1):
+            drawing = rows[flags[:, column] & STARTING_SHRINE != 0]
+            if not len(drawing):
+                continue
+            self._refill_empty(drawing)
+            cards = POOL_CARDS[self.pool[drawing, self.pool_pos[drawing]]]
+            self.pool_pos[drawing] += 1
+            self._append(drawing, np.full(len(drawing), column), cards, 0)
+
+    def usable(self, rows):
+        """(len(rows), width) mask of the mover's cards usable this turn, width being the longest of their hands"""
+        players = self.current[rows]
+        lengths = self.hand_len[rows, players]
+        width = max(int(lengths.max(initial=0)), 1)
+        return ((np.arange(width) < lengths[:, None])
+                & (self.hand_turn[rows, players, :width] < self.turn[rows][:, None]))
+
+    #hands only ever grow at the end with the current turn, so they stay sorted by acquired turn:
+    #the first card is the oldest and this turn's picks are the last ones
+
+    def has_usable(self, rows):
+        players = self.current[rows]
+        return (self.hand_len[rows, players] > 0) & (self.hand_turn[rows, players, 0] < self.turn[rows])
+
+    def picked_this_turn(self, rows):
+        players = self.current[rows]
+        last = np.maximum(self.hand_len[rows, players] - 1, 0)
+        return (self.hand_len[rows, players] > 0) & (self.hand_turn[rows, players, last] == self.turn[rows])
+
+    def ability_worth_using(self, rows):
+        players = self.current[rows]
+        kinds = self.kinds[rows, players]
+        return (((kinds == ABILITY_CLONE) & (self.clone_turn[rows, players] == NO_CLONE))
+                | ((kinds == ABILITY_ACTIVE) & self.ready[rows, players]))
+
+    def pick(self, rows):
+        self._refill_empty(rows)
+        players = self.current[rows]
+        positions = self.pool_pos[rows]
+        cards = POOL_CARDS[self.pool[rows, positions]]
+        self.pool_pos[rows] = positions + 1
+        self._append(rows, players, cards, self.turn[rows])
+        self.stat_picked += len(rows)
+        self._refill_empty(rows)
+
+    def select(self, rows, indexes):
+        """select_shrine for the mover; selections of missing or fresh cards are ignored"""
+        players = self.current[rows]
+        valid = (indexes >= 0) & (indexes < self.hand_len[rows, players])
+        safe = np.where(valid, indexes, 0)
+        valid &= self.hand_turn[rows, players, safe] < self.turn[rows]
+        self.selected[rows[valid], players[valid]] = indexes[valid]
+
+    def use(self, rows):
+        players = self.current[rows]
+        selected = self.selected[rows, players]
+        has_selection = (selected >= 0) & (selected < self.hand_len[rows, players])
+        safe = np.where(has_selection, selected, 0)
+        selection_usable = has_selection & (self.hand_turn[rows, players, safe] < self.turn[rows])
+
+        #without a selection the first usable card is the first card
+        indexes = np.where(has_selection, selected, 0)
+        acting = np.where(has_selection, selection_usable, self.has_usable(rows))
+
+        rows, players, indexes, cleared = rows[acting], players[acting], indexes[acting], has_selection[acting]
+        cards = self._remove(rows, players, indexes)
+        self.selected[rows[cleared], players[cleared]] = NO_SELECTION
+        self.stat_used += np.bincount(players, minlength=2)
+        self.stat_card_uses += np.bincount(cards, minlength=len(SHRINE_NAMES))
+
+    def ability(self, rows):
+        players = self.current[rows]
+        kinds = self.kinds[rows, players]
+
+        spend = (kinds == ABILITY_ACTIVE) & self.ready[rows, players]
+        r, p = rows[spend], players[spend]
+        self.ready[r, p] = False
+        self.ready_turn[r, p] = self.turn[r] + self.cooldowns[r, p]
+
+        toggling = kinds == ABILITY_CLONE
+        r, p = rows[toggling], players[toggling]
+        spawning = self.clone_turn[r, p] == NO_CLONE
+        self.clone_turn[r, p] = np.where(spawning, self.turn[r], NO_CLONE)
+
+        self.stat_abilities += np.bincount(players[spend], minlength=2) + np.bincount(p[spawning], minlength=2)
+
+    def end_turn(self, rows):
+        self.selected[rows, self.current[rows]] = NO_SELECTION
+        self.current[rows] ^= 1
+        turn = self.turn[rows] + 1
+        self.turn[rows] = turn
+        self.ready[rows] |= self.ready_turn[rows] == turn[:, None]
+        if not self.clones_expire:
+            return
+        clones = self.clone_turn[rows]
+        lifetimes = self.lifetimes[rows]
+        expired = (clones != NO_CLONE) & (lifetimes > 0) & (clones + lifetimes == turn[:, None])
+        self.clone_turn[rows] = np.where(expired, NO_CLONE, clones)
+
+    def apply(self, rows, actions, indexes=None):
+        """Run each game's chosen action; indexes gives SELECT targets aligned with rows"""
+        #one stable sort groups the games by action instead of a mask per action
+        order = np.argsort(actions.astype(np.int8), kind="stable")
+        bounds = np.searchsorted(actions[order], np.arange(END + 1)).tolist()
+        for action, method in ((PICK, self.pick), (USE, self.use), (ABILITY, self.ability)):
+            if bounds[action + 1] > bounds[action]:
+                method(rows[order[bounds[action]:bounds[action + 1]]])
+        chosen = order[bounds[SELECT]:bounds[SELECT + 1]]
+        if indexes is not None and len(chosen):
+            self.select(rows[chosen], indexes[chosen])
+
+    def state(self, game):
+        """Gameplay state of one game in the form scalar_state() reports"""
+        columns = []
+        for column in (0, 1):
+            length = self.hand_len[game, column]
+            clone = self.clone_turn[game, column]
+            columns.append((
+                bool(self.ready[game, column]),
+                0 if self.ready[game, column] else int(self.cooldowns[game, column] - (self.ready_turn[game, column] - self.turn[game])),
+                None if clone == NO_CLONE else int(self.turn[game] - clone),
+                None if self.selected[game, column] == NO_SELECTION else int(self.selected[game, column]),
+                [(SHRINE_NAMES[card], int(turn)) for card, turn in
+                 zip(self.hand_card[game, column, :length], self.hand_turn[game, column, :length])]
+            ))
+        pos = int(self.pool_pos[game])
+        return (int(self.turn[game]), int(self.current[game]) + 1, bytes(self.pool[game, pos:]), columns)
+
+def scalar_state(game):
+    columns = []
+    for p in [1, 2]:
+        columns.append((
+            bool(game.god_ability_ready[p]), game.god_ability_counters[p], game.clones[p], game.selected_shrine[p],
+            [(sc.card, sc.acquired_turn) for sc in game.shrine_cards[p]]
+        ))
+    return (game.turn_number, game.current_player, bytes(game.pool_order[game.pool_pos:]), columns)
+
+def random_policy(batch, rows, rng):
+    """Vectorised simulate.random_policy, drawing from each game's stream in the same order"""
+    actions = rng.randbelow(rows, 5)
+    #a select targets one of the usable cards at random, like simulate's "select"
+    selecting = rows[actions == SELECT]
+    usable = batch.usable(selecting)
+    counts = usable.sum(axis=1)
+    having = counts > 0
+    nth = np.zeros(len(selecting), dtype=np.int64)
+    nth[having] = rng.randbelow(selecting[having], counts[having])
+    indexes = np.full(len(rows), -1)
+    indexes[actions == SELECT] = np.where(having, np.argmax(np.cumsum(usable, axis=1) > nth[:, None], axis=1), -1)
+    return actions, indexes
+
+def greedy_policy(batch, rows, rng):
+    """Vectorised simulate.greedy_policy"""
+    actions = np.full(len(rows), END)
+    actions[~batch.picked_this_turn(rows)] = PICK
+    actions[batch.has_usable(rows)] = USE
+    actions[batch.ability_worth_using(rows)] = ABILITY
+    return actions, None
+
+def hoarder_policy(batch, rows, rng):
+    """Vectorised simulate.hoarder_policy"""
+    players = batch.current[rows]
+    actions = np.full(len(rows), END)
+    actions[(batch.hand_len[rows, players] >= 5) & batch.has_usable(rows)] = USE
+    actions[~batch.picked_this_turn(rows)] = PICK
+    return actions, None
+
+POLICIES = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+    "hoarder": hoarder_policy
+}
+
+def script_hash(game, turn, step):
+    """Deterministic per-(game, turn, step) value so both engines can replay the same pseudo-random choices"""
+    h = (game * 0x9E3779B1 + turn * 0x85EBCA77 + step * 0xC2B2AE3D) & 0xFFFFFFFF
+    h ^= h >> 15
+    h = (h * 0x2C1B3C6D) & 0xFFFFFFFF
+    return h ^ (h >> 12)
+
+def scripted_policy(batch, rows, rng, steps):
+    h = script_hash(rows.astype(np.uint64), batch.turn[rows].astype(np.uint64), steps[rows].astype(np.uint64))
+    usable = batch.usable(rows)
+    counts = usable.sum(axis=1)
+    nth = (h >> 8) % np.maximum(counts, 1).astype(np.uint64)
+    indexes = np.argmax(np.cumsum(usable, axis=1) > nth[:, None].astype(np.int64), axis=1)
+    return (h % 5).astype(np.int64), np.where(counts > 0, indexes, -1)
+
+def scripted_scalar_action(game, index, step):
+    """scripted_policy for one GameEngine; returns (action, select index)"""
+    h = script_hash(index, game.turn_number, step)
+    usable = [i for i, sc in enumerate(game.shrine_cards[game.current_player]) if sc.acquired_turn < game.turn_number]
+    return h % 5, usable[(h >> 8) % len(usable)] if usable else -1
+
+def play(batch, policies, rng, end_chance=0.0, max_turns=200, scripted=False):
+    """Play every game to its end in lockstep, one action per game per step.
+
+    Mirrors simulate.play_game: up to MAX_ACTIONS_PER_TURN policy actions a
+    turn, then end_turn; after each turn the game ends past max_turns or with
+    probability end_chance. rng is a BatchRandom with a stream per game.
+    Returns (turns played per game, ready samples and turn samples per
+    player column).
+    """
+    n = batch.size
+    active = np.ones(n, dtype=bool)
+    taken = np.zeros(n, dtype=np.int64)
+    ready_samples = np.zeros(2, dtype=np.int64)
+    turn_samples = np.zeros(2, dtype=np.int64)
+
+    def sample(rows):
+        players = batch.current[rows]
+        turn_samples[:] += np.bincount(players, minlength=2)
+        ready_samples[:] += np.bincount(players, weights=batch.ready[rows, players], minlength=2).astype(np.int64)
+
+    sample(np.arange(n))
+    rows = np.arange(n)
+    while len(rows):
+        actions = np.full(len(rows), END)
+        indexes = np.full(len(rows), -1)
+        asking = taken[rows] < MAX_ACTIONS_PER_TURN
+        #one call covers both players when they share a policy
+        shared = scripted or policies[0] is policies[1]
+        for column in (None,) if shared else (0, 1):
+            mask = asking if shared else asking & (batch.current[rows] == column)
+            if mask.any():
+                subset = rows[mask]
+                if scripted:
+                    chosen, targets = scripted_policy(batch, subset, rng, taken)
+                else:
+                    chosen, targets = policies[column or 0](batch, subset, rng)
+                actions[mask] = chosen
+                if targets is not None:
+                    indexes[mask] = targets
+
+        batch.apply(rows, actions, indexes)
+        moving = actions != END
+        taken[rows[moving]] += 1
+
+        ending = rows[~moving]
+        if len(ending):
+            batch.end_turn(ending)
+            taken[ending] = 0
+            finished = batch.turn[ending] > max_turns
+            if end_chance:
+                finished |= rng.random(ending) < end_chance
+            active[ending[finished]] = False
+            sample(ending[~finished])
+            rows = np.flatnonzero(active)
+
+    return batch.turn.copy(), ready_samples, turn_samples
+
+def collect(batch, turns, ready_samples, turn_samples, stats):
+    """Add a finished batch's totals into a simulate.MatchStats"""
+    stats.games += batch.size
+    stats.turns += int(turns.sum())
+    stats.refills += batch.stat_refills
+    stats.cards_picked += batch.stat_picked
+    for column in (0, 1):
+        stats.cards_used[column + 1] += int(batch.stat_used[column])
+        stats.ability_uses[column + 1] += int(batch.stat_abilities[column])
+        stats.ready_samples[column + 1] += int(ready_samples[column])
+        stats.turn_samples[column + 1] += int(turn_samples[column])
+    for name, count in zip(SHRINE_NAMES, batch.stat_card_uses.tolist()):
+        stats.card_uses[name] += count
+    return stats
+
+def run_chunk(task):
+    """simulate.run_chunk for the batch engine: play one seeded chunk of games for a pairing"""
+    from simulate import MatchStats
+
+    pairing, seed, games, policy_names, end_chance, max_turns = task
+    rng = BatchRandom.forked(seed, games)
+    gods = np.tile([GOD_IDS[pairing[0]], GOD_IDS[pairing[1]]], (games, 1))
+    batch = BatchEngine(gods, RefillSource(seed))
+    rows = np.arange(games)
+    batch.start(np.stack([rng.randbelow(rows, len(SHRINE_NAMES)) for _ in range(2)], axis=1))
+    policies = [POLICIES[policy_names[0]], POLICIES[policy_names[1]]]
+    result = play(batch, policies, rng, end_chance, max_turns)
+    return pairing, collect(batch, *result, MatchStats())
+
+def check(games, turns, seed, policy):
+    """Play seeded games in both engines and return how many end in a different state"""
+    from engine import GameEngine
+    import simulate
+
+    setup = np.random.default_rng(seed)
+    gods = setup.integers(0, len(AVAILABLE_GODS), (games, 2))
+    apollo = setup.integers(0, len(SHRINE_NAMES), (games, 2))
+    batch = BatchEngine(gods, RefillSource(seed), record_refills=True)
+    batch.start(apollo)
+    scripted = policy == "scripted"
+    policies = None if scripted else [POLICIES[policy]] * 2
+    play(batch, policies, BatchRandom.forked(seed, games), 0.0, turns, scripted=scripted)
+
+    refill_orders = batch.refill_orders()
+    mismatches = 0
+    for g in range(games):
+        rng = GameRandom(seed).fork(g)
+        game = GameEngine(verbose=False, refill_orders=refill_orders[g])
+        game.select_god(1, AVAILABLE_GODS[gods[g, 0]])
+        game.select_god(2, AVAILABLE_GODS[gods[g, 1]])
+        while game.game_stage == "apollo_selection":
+            p = game.current_selection_player
+            game.select_apollo_shrine(p, SHRINE_NAMES[apollo[g, p - 1]])
+
+        scalar_policy = None if scripted else simulate.POLICIES[policy]
+        while game.turn_number <= turns:
+            for step in range(MAX_ACTIONS_PER_TURN):
+                if scripted:
+                    action, index = scripted_scalar_action(game, g, step)
+                    action = simulate.ACTIONS[action]
+                else:
+                    action = scalar_policy(game, rng)
+                    if action == "select":
+                        #resolved as simulate.play_game does, drawing only when a card is usable
+                        usable = simulate.usable_indexes(game, game.current_player)
+                        index = rng.choice(usable) if usable else -1
+                if action == "end":
+                    break
+                elif action == "pick":
+                    game.pick_shrine()
+                elif action == "use":
+                    game.use_shrine_card()
+                elif action == "ability":
+                    game.use_god_ability()
+                elif action == "select" and index >= 0:
+                    game.select_shrine(game.current_player, index)
+            game.end_turn()
+
+        if scalar_state(game) != batch.state(g):
+            mismatches += 1
+            if mismatches <= 3:
+                print(f"game {g} ({AVAILABLE_GODS[gods[g, 0]]} vs {AVAILABLE_GODS[gods[g, 1]]}) differs:\n"
+                      f"  scalar {scalar_state(game)}\n  batch  {batch.state(g)}", file=sys.stderr)
+    return mismatches
+
+def bench(games, policy, end_chance, max_turns, seed):
+    """Games per second for the scalar simulator loop and for one batch of the same games"""
+    from engine import GameRandom
+    import simulate
+
+    pairing = ("Athena", "Hera")
+    scalar_games = max(1, games // 20)
+    rng = GameRandom(seed)
+    stats = simulate.MatchStats()
+    policies = {1: simulate.POLICIES[policy], 2: simulate.POLICIES[policy]}
+    refill_orders = simulate.refill_stream(seed)
+    started = time.perf_counter()
+    for _ in range(scalar_games):
+        simulate.play_game(*pairing, policies, rng, stats, end_chance, max_turns, refill_orders)
+    scalar_rate = scalar_games / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    run_chunk((pairing, seed, games, (policy, policy), end_chance, max_turns))
+    batch_rate = games / (time.perf_counter() - started)
+    return scalar_rate, batch_rate
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Check and benchmark the NumPy batch engine")
+    parser.add_argument("command", choices=("check", "bench"))
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--turns", type=int, default=40, help="turns played per game by check")
+    parser.add_argument("--policy", default="", help="policy for both players; check runs all by default")
+    parser.add_argument("--end-chance", type=float, default=0.05)
+    parser.add_argument("--max-turns", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "check":
+        failed = 0
+        for policy in [args.policy] if args.policy else [*POLICIES, "scripted"]:
+            mismatches = check(args.games, args.turns, args.seed, policy)
+            failed += mismatches
+            print(f"{policy:<10} {args.games} games x {args.turns} turns: {mismatches} mismatches", file=sys.stderr)
+        sys.exit(1 if failed else 0)
+    else:
+        policy = args.policy or "greedy"
+        scalar_rate, batch_rate = bench(args.games, policy, args.end_chance, args.max_turns, args.seed)
+        print(f"{policy}: scalar {scalar_rate:.0f} games/s, batch {batch_rate:.0f} games/s "
+              f"({batch_rate / scalar_rate:.1f}x)", file=sys.stderr)
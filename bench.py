@@ -0,0 +1,250 @@
+"""Reproducible rendering and logic benchmarks for God's Gauntlet.
+
+Runs under the SDL dummy video driver, so it needs no display and draws the
+same pixels as a real window minus the final present. Every case reports a
+rate (higher is better): frames/s for drawing and turns/s for the rules.
+
+    python bench.py --out bench.json
+    python bench.py --baseline bench.json --threshold 0.10
+
+With --baseline, each case is compared to the saved run. The process exits
+with status 1 if any case got slower than the threshold allows. Seeds are
+fixed, so runs differ only by machine noise. Each case reports the median of
+--repeats timed batches.
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+import numpy as np
+import pygame
+
+import main
+import ai
+from engine import GameEngine, AVAILABLE_GODS, SHRINE_NAMES
+
+RESOLUTIONS = {"720p": (1280, 720), "1080p": (1920, 1080), "4k": (3840, 2160)}
+PARTICLE_COUNTS = (0, 200, 5000)
+SHRINE_LIST_CARDS = (0, 10, 25, 50)
+BENCH_SEED = 1234
+#every colour the game spawns particles in (EVENT_EFFECTS and the player colours)
+PARTICLE_PALETTE = np.array([main.GOLD, main.GRAY, main.ORANGE, main.CYAN, main.PLAYER_COLORS[1], main.PLAYER_COLORS[2]])
+
+def measure(step, repeats, min_time):
+    """Return per-batch rates of step() calls per second, each batch lasting at least min_time"""
+    step()  # warm caches before calibrating
+    iterations = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            step()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        iterations *= 2
+
+    rates = [iterations / elapsed]
+    for _ in range(repeats - 1):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            step()
+        rates.append(iterations / (time.perf_counter() - started))
+    return rates
+
+def playing_game(cards_per_player=5):
+    """A seeded game in the playing stage with cards_per_player cards in each hand"""
+    game = main.GameState(verbose=False, seed=BENCH_SEED)
+    game.select_god(1, "Athena")
+    game.select_god(2, "Hermes")
+    game.turn_number = 2
+    for p in [1, 2]:
+        game.shrine_cards[p] = [game.card_type(card=SHRINE_NAMES[i % len(SHRINE_NAMES)], acquired_turn=i % 3)
+                                for i in range(cards_per_player)]
+    game.selected_shrine[1] = 0 if cards_per_player else None
+    return game
+
+def fill_particles(particles, count, width, height):
+    """Hold count live particles spread over the screen at mixed ages, sizes and game colours"""
+    particles.clear()
+    if not count:
+        return
+    particles.spawn(0, 0, main.GOLD, count)
+    rng = np.random.default_rng(BENCH_SEED)
+    slots = particles.live_slots()
+    particles.pos[slots, 0] = rng.uniform(0, width, len(slots))
+    particles.pos[slots, 1] = rng.uniform(0, height, len(slots))
+    particles.life[slots] = rng.integers(1, particles.MAX_LIFE + 1, len(slots))
+    particles.color[slots] = PARTICLE_PALETTE[rng.integers(0, len(PARTICLE_PALETTE), len(slots))]
+
+def bench_draw_window(resolution, particle_count):
+    width, height = RESOLUTIONS[resolution]
+    surface = pygame.display.set_mode((width, height))
+    game = playing_game()
+    fill_particles(game.particles, particle_count, width, height)
+    mouse_pos = (width // 2, height // 2)
+    return lambda: main.draw_window(surface, game, mouse_pos, width, height)
+
+def bench_shrine_list(cards):
+    surface = pygame.display.set_mode(RESOLUTIONS["720p"])
+    game = playing_game(cards)
+    layout = main.get_playing_layout(*surface.get_size())
+    panels = layout['shrine_panels']
+    #hover the second card so the hover animation path runs
+    mouse_pos = (panels[1].x + 40, panels[1].y + 45 + 40 + 10)
+
+    views = {p: main.get_shrine_view(panels[p]) for p in [1, 2]}
+
+    def step():
+        for p in [1, 2]:
+            main.draw_shrine_list(surface, game, p, panels[p].x + 20, panels[p].y + 45, mouse_pos, panels[p].width,
+                                  view=views[p])
+    return step
+
+def bench_god_selection():
+    surface = pygame.display.set_mode(RESOLUTIONS["720p"])
+    game = main.GameState(verbose=False, seed=BENCH_SEED)
+    return lambda: main.draw_god_selection_screen(surface, game, (300, 250), *surface.get_size())
+
+def bench_apollo_selection():
+    surface = pygame.display.set_mode(RESOLUTIONS["720p"])
+    game = main.GameState(verbose=False, seed=BENCH_SEED)
+    game.select_god(1, "Apollo")
+    game.select_god(2, "Athena")
+    return lambda: main.draw_apollo_selection_screen(surface, game, (300, 250), *surface.get_size())
+
+def bench_turns(engine_class, turns=200):
+    """Play turns seeded turns of pick/ability/use/end per step; GameState's particles are cleared every turn"""
+    gods = [god for god in AVAILABLE_GODS if god != "Apollo"]
+    state = {"games": 0}
+
+    def step():
+        index = state["games"]
+        state["games"] += 1
+        game = engine_class(verbose=False, seed=BENCH_SEED + index)
+        game.select_god(1, gods[index % len(gods)])
+        game.select_god(2, gods[(index // len(gods)) % len(gods)])
+        particles = getattr(game, "particles", None)
+        for _ in range(turns):
+            game.pick_shrine()
+            game.use_god_ability()
+            game.use_shrine_card()
+            game.end_turn()
+            if particles is not None:
+                #drop the turn's bursts so the pool never grows and only the turn logic is timed
+                particles.clear()
+    return step, turns
+
+def bench_ai_search(iterations=512):
+    """Run a fixed number of seeded search iterations from a mid-game position; units are moves made"""
+    game = playing_game()
+    state = ai.SearchState.from_game(game)
+
+    def step():
+        search = ai.Search(state.copy(random.Random(BENCH_SEED)))
+        for _ in range(iterations):
+            search._iterate()
+        return search.moves
+
+    return step, step()
+
+def cases():
+    """Yield (name, unit, factory) for every benchmark; factory returns (step, units per step)"""
+    for resolution in RESOLUTIONS:
+        for count in PARTICLE_COUNTS:
+            yield (f"draw_window/{resolution}/{count}_particles", "frames/s",
+                   lambda resolution=resolution, count=count: (bench_draw_window(resolution, count), 1))
+    for cards in SHRINE_LIST_CARDS:
+        yield f"draw_shrine_list/{cards}_cards", "frames/s", lambda cards=cards: (bench_shrine_list(cards), 1)
+    yield "god_selection_screen", "frames/s", lambda: (bench_god_selection(), 1)
+    yield "apollo_selection_screen", "frames/s", lambda: (bench_apollo_selection(), 1)
+    yield "turns/GameEngine", "turns/s", lambda: bench_turns(GameEngine)
+    yield "turns/GameState", "turns/s", lambda: bench_turns(main.GameState)
+    yield "ai_search", "moves/s", bench_ai_search
+
+def run(args):
+    pygame.display.init()
+    pygame.font.init()
+
+    results = {}
+    for name, unit, factory in cases():
+        if args.only and not any(part in name for part in args.only.split(",")):
+            continue
+        step, units = factory()
+        rates = [rate * units for rate in measure(step, args.repeats, args.min_time)]
+        results[name] = {"unit": unit, "value": round(statistics.median(rates), 2),
+                         "samples": [round(rate, 2) for rate in rates]}
+        print(f"{name:<40} {results[name]['value']:>12.1f} {unit}", file=sys.stderr)
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "sdl": ".".join(map(str, pygame.get_sdl_version())),
+            "numpy": np.__version__,
+            "video_driver": os.environ["SDL_VIDEODRIVER"],
+            "repeats": args.repeats,
+            "min_time": args.min_time
+        },
+        "results": results
+    }
+
+def compare(report, baseline, threshold):
+    """Print each case against the baseline and return the names that regressed"""
+    regressions = []
+    print(f"{'case':<40} {'baseline':>12} {'current':>12} {'change':>8}", file=sys.stderr)
+    for name, result in report["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            print(f"{name:<40} {'-':>12} {result['value']:>12.1f}      new", file=sys.stderr)
+            continue
+        change = result["value"] / old["value"] - 1 if old["value"] else 0.0
+        regressed = change < -threshold
+        result["baseline"] = old["value"]
+        result["change"] = round(change, 4)
+        result["regressed"] = regressed
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<40} {old['value']:>12.1f} {result['value']:>12.1f} {change:>+8.1%}"
+              f"{'  REGRESSION' if regressed else ''}", file=sys.stderr)
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark God's Gauntlet rendering and rules")
+    parser.add_argument("--out", default="", help="write results as JSON to this path, - for stdout")
+    parser.add_argument("--baseline", default="", help="results JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before a case counts as regressed")
+    parser.add_argument("--repeats", type=int, default=5, help="timed batches per case")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per batch")
+    parser.add_argument("--only", default="", help="comma-separated substrings selecting cases")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = run(args)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(report, baseline, args.threshold)
+        report["meta"]["baseline"] = args.baseline
+        report["meta"]["threshold"] = args.threshold
+        report["regressions"] = regressions
+
+    if args.out == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.out:
+        with open(args.out, "w") as file:
+            json.dump(report, file, indent=2)
+
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,48 @@
+"""Turn-keyed scheduler for timed rule effects.
+
+Effects are (turn, sequence, kind, player) entries in a binary min-heap, so
+ending a turn pops only the entries due on it. Each turn costs
+O(k log n) for k expiring effects and never visits idle players. Entries are
+not removed early. The handler of an expired entry checks that it is still
+current, e.g. a clone despawned by hand leaves a stale expiry behind.
+
+Card readiness is not scheduled. Each card's acquired_turn already
+answers it with one comparison, and snapshots, the UI and the AI all edit
+hands directly.
+"""
+import heapq
+
+#ability recharged, clone lifetime over
+RECHARGE, CLONE_EXPIRES = range(2)
+
+class EffectScheduler:
+    __slots__ = ("heap", "sequence")
+
+    def __init__(self):
+        self.heap = []
+        self.sequence = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def clear(self):
+        self.heap.clear()
+        self.sequence = 0
+
+    def schedule(self, turn, kind, player):
+        """Queue an effect that fires when the turn number reaches turn"""
+        heapq.heappush(self.heap, (turn, self.sequence, kind, player))
+        self.sequence += 1
+
+    def pop_due(self, turn):
+        """Remove and return (kind, player) for every effect due by turn, in the order they were scheduled"""
+        heap = self.heap
+        due = []
+        while heap and heap[0][0] <= turn:
+            entry = heapq.heappop(heap)
+            due.append((entry[2], entry[3]))
+        return due
+
+    def pending(self):
+        """(turn, kind, player) of every queued effect, soonest first"""
+        return [(turn, kind, player) for turn, _, kind, player in sorted(self.heap)]
@@ -0,0 +1,510 @@
+"""Display-free rules engine for God's Gauntlet.
+
+GameEngine holds only gameplay state and never touches pygame, so it can be
+imported by simulations and servers without starting SDL. Front ends react
+to what happens by subscribing to the events it emits.
+"""
+import random
+
+from gamelog import NULL_LOGGER, INFO, WARNING, console_logger
+from effects import EffectScheduler, RECHARGE, CLONE_EXPIRES
+from registry import (REGISTRY, ABILITY_PASSIVE, ABILITY_ACTIVE, ABILITY_CLONE, CHOOSES_STARTING_SHRINE,
+                      STARTING_SHRINE, ENHANCES_SHRINES)
+
+#pool slot -> card name; every card appears once per copy
+SHRINE_IDS = REGISTRY.shrine_ids
+SHRINE_COUNT = len(SHRINE_IDS)
+#each distinct shrine card once, in SHRINE_IDS order
+SHRINE_NAMES = REGISTRY.shrine_names
+
+AVAILABLE_GODS = REGISTRY.god_names
+GOD_DESCRIPTIONS = REGISTRY.descriptions
+
+#per-god tables indexed by GOD_IDS[name], see registry.py
+GOD_IDS = REGISTRY.god_ids
+GOD_ABILITIES = REGISTRY.abilities
+GOD_COOLDOWNS = REGISTRY.cooldowns
+GOD_FLAGS = REGISTRY.flags
+GOD_BLESSINGS = REGISTRY.blessings
+GOD_CLONE_LIFETIMES = REGISTRY.clone_lifetimes
+#actions a driver (simulator policy or AI) issues per turn before ending it; the rules do not enforce it
+MAX_ACTIONS_PER_TURN = 6
+
+#pool orders are bytearrays of indexes into SHRINE_IDS
+SHRINE_ORDER = bytes(range(SHRINE_COUNT))
+
+MASK64 = (1 << 64) - 1
+GAMEPLAY_STREAM = 1
+COSMETIC_STREAM = 2
+
+class GameRandom:
+    """Seedable SplitMix64 generator.
+
+    The whole state is one 64-bit integer, so a generator is cheap to create,
+    copy and snapshot. fork() derives independent streams without advancing
+    the parent.
+    """
+    __slots__ = ("state",)
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.state = seed & MASK64
+
+    def next_u64(self):
+        self.state = z = (self.state + 0x9E3779B97F4A7C15) & MASK64
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+        return z ^ (z >> 31)
+
+    def fork(self, stream):
+        return GameRandom(GameRandom(self.state ^ (stream * 0xD1B54A32D192ED03)).next_u64())
+
+    def randbelow(self, n):
+        return (self.next_u64() * n) >> 64
+
+    def random(self):
+        return (self.next_u64() >> 11) * (1.0 / (1 << 53))
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def randint(self, a, b):
+        return a + self.randbelow(b - a + 1)
+
+    def choice(self, seq):
+        return seq[self.randbelow(len(seq))]
+
+    def shuffle(self, seq):
+        """Fisher-Yates shuffle in place"""
+        for i in range(len(seq) - 1, 0, -1):
+            j = self.randbelow(i + 1)
+            seq[i], seq[j] = seq[j], seq[i]
+
+def permutation_batch(seed, count, size=SHRINE_COUNT):
+    """Pre-generate count independent shuffles of range(size) as a (count, size) uint8 array.
+
+    Rows can be fed to GameEngine(refill_orders=...) so simulators draw every
+    refill order for many games in one vectorised call.
+    """
+    import numpy as np
+
+    orders = np.tile(np.arange(size, dtype=np.uint8), (count, 1))
+    return np.random.default_rng(seed).permuted(orders, axis=1)
+
+class ShrineCard:
+    __slots__ = ("card", "acquired_turn")
+
+    def __init__(self, card, acquired_turn):
+        self.card = card
+        self.acquired_turn = acquired_turn
+
+class GameEngine:
+    """Gameplay state and rules for one free-for-all match, two players by default.
+
+    Listeners registered with subscribe() are called as listener(event, data)
+    after each state change, e.g. ("shrine_picked", {"player": 1, "card": "Ares"}).
+
+    Per-player state lives in fixed lists indexed by player number, slot 0
+    unused. god_ids mirrors selected_gods as registry IDs for the rules' table
+    lookups. Timers are stored as turn numbers: the turn a spent ability
+    recharges on and the turn a clone spawned on. end_turn() wakes only the
+    effects due that turn through an EffectScheduler, so a turn never visits
+    every player. Instances use __slots__, and reset_game() refills the
+    existing containers instead of building new ones, so many idle matches
+    stay small.
+    """
+    __slots__ = (
+        "verbose", "logger", "listeners", "seed", "rng", "cosmetic_rng", "refill_orders",
+        "player_count", "game_stage", "current_selection_player", "selected_gods", "god_ids",
+        "apollo_players", "current_player", "turn_number", "ability_ready_turn", "god_ability_ready",
+        "pool_order", "pool_pos", "shrine_cards", "selected_shrine", "_action",
+        "clone_turns", "effects", "game_ended", "winner"
+    )
+    card_type = ShrineCard
+
+    def __init__(self, verbose=True, seed=None, refill_orders=None, logger=None, players=2):
+        self.verbose = verbose
+        if logger is None:
+            logger = console_logger() if verbose else NULL_LOGGER
+        self.logger = logger
+        self.listeners = []
+
+        self.rng = GameRandom(0)
+        self.cosmetic_rng = GameRandom(0)
+        self.refill_orders = iter(refill_orders) if refill_orders is not None else None
+
+        self.player_count = players
+        slots = players + 1
+        self.selected_gods = [None] * slots
+        self.god_ids = [None] * slots
+        self.apollo_players = []
+        self.ability_ready_turn = [0] * slots
+        self.god_ability_ready = [False] + [True] * players
+        self.pool_order = bytearray(SHRINE_ORDER)
+        self.shrine_cards = [None] + [[] for _ in range(players)]
+        self.selected_shrine = [None] * slots
+        self.clone_turns = [None] * slots
+        self.effects = EffectScheduler()
+        self._reset(seed)
+
+    def _reset(self, seed):
+        """Put the match back at god selection, reusing every container"""
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+        self.rng.state = GameRandom(seed).fork(GAMEPLAY_STREAM).state
+        self.cosmetic_rng.state = GameRandom(seed).fork(COSMETIC_STREAM).state
+
+        self.game_stage = "god_selection"
+        self.current_selection_player = 1
+        self.apollo_players.clear()
+
+        self.current_player = 1
+        self.turn_number = 1
+
+        for p in self.players:
+            self.selected_gods[p] = None
+            self.god_ids[p] = None
+            self.ability_ready_turn[p] = 0
+            self.god_ability_ready[p] = True
+            self.shrine_cards[p].clear()
+            self.selected_shrine[p] = None
+            self.clone_turns[p] = None
+        self.effects.clear()
+
+        self._shuffle_pool()
+        self.last_action = "Select your main god!"
+        self.game_ended = False
+        self.winner = None
+
+    @property
+    def players(self):
+        return range(1, self.player_count + 1)
+
+    @property
+    def god_ability_counters(self):
+        """Turn ends since each player's ability was spent, 0 while it is ready"""
+        turn = self.turn_number
+        return [0] + [0 if self.god_ability_ready[p] else GOD_COOLDOWNS[self.god_ids[p]] - (self.ability_ready_turn[p] - turn)
+                      for p in self.players]
+
+    @property
+    def clones(self):
+        """Turn ends each player's clone has been active for, or None"""
+        turn = self.turn_number
+        return [None] + [None if spawned is None else turn - spawned for spawned in self.clone_turns[1:]]
+
+    def restore_timers(self, ready, counters, clones):
+        """Rebuild the timers and scheduled effects from per-player ready flags, counters and clone ages.
+
+        Takes the values god_ability_counters and clones report, as
+        snapshots store them; turn_number and the hands must already be set.
+        """
+        self.effects.clear()
+        turn = self.turn_number
+        for p in self.players:
+            self.god_ability_ready[p] = ready[p]
+            if not ready[p]:
+                self.ability_ready_turn[p] = turn + GOD_COOLDOWNS[self.god_ids[p]] - counters[p]
+                self.effects.schedule(self.ability_ready_turn[p], RECHARGE, p)
+            self.clone_turns[p] = None if clones[p] is None else turn - clones[p]
+            lifetime = GOD_CLONE_LIFETIMES[self.god_ids[p]] if self.god_ids[p] is not None else 0
+            if clones[p] is not None and lifetime:
+                self.effects.schedule(self.clone_turns[p] + lifetime, CLONE_EXPIRES, p)
+
+    @property
+    def pool_size(self):
+        return len(self.pool_order) - self.pool_pos
+
+    @property
+    def shrine_pool(self):
+        """Names of the cards left in the pool, next draw first"""
+        return [SHRINE_IDS[i] for i in self.pool_order[self.pool_pos:]]
+
+    def _draw_from_pool(self):
+        card = SHRINE_IDS[self.pool_order[self.pool_pos]]
+        self.pool_pos += 1
+        return card
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def emit(self, event, **data):
+        for listener in self.listeners:
+            listener(event, data)
+
+    def _log(self, message, level=INFO, **fields):
+        """Buffer a structured log record; message is a template filled from fields"""
+        if level >= self.logger.level:
+            self.logger.log(level, message, turn=self.turn_number, **fields)
+
+    def _announce(self, template, level=INFO, **fields):
+        """Show the filled template as last_action and log the template itself with its fields"""
+        fields["turn"] = self.turn_number
+        #formatted on first read; headless loops rarely read it
+        self._action = (template, fields)
+        if level >= self.logger.level:
+            self.logger.log(level, template, **fields)
+
+    @property
+    def last_action(self):
+        action = self._action
+        if action.__class__ is tuple:
+            template, fields = action
+            action = self._action = template.format(**fields)
+        return action
+
+    @last_action.setter
+    def last_action(self, text):
+        self._action = text
+
+    def select_god(self, player, god_name):
+        """Called during god selection phase"""
+        self.selected_gods[player] = god_name
+        self.god_ids[player] = GOD_IDS[god_name]
+        self.emit("god_selected", player=player, god=god_name)
+
+        if GOD_FLAGS[self.god_ids[player]] & CHOOSES_STARTING_SHRINE:
+            self.apollo_players.append(player)
+
+        if player < self.player_count:
+            self.current_selection_player = player + 1
+            self.last_action = f"Player {player + 1}, select your god!"
+        else:
+
+            if self.apollo_players:
+                self.game_stage = "apollo_selection"
+                self.current_selection_player = self.apollo_players[0]
+                self.last_action = f"Player {self.current_selection_player} (Apollo), choose your starting shrine card!"
+            else:
+                self._start_game()
+
+        self._log("Player {player} selected {god}", player=player, god=god_name)
+
+    def _start_game(self):
+        """Initialize the game after all selections are complete"""
+        self.game_stage = "playing"
+
+        for player in self.players:
+            if GOD_FLAGS[self.god_ids[player]] & STARTING_SHRINE:
+                if not self.pool_size:
+                    self._refill_pool()
+                card = self._draw_from_pool()
+                self.shrine_cards[player].append(
+                    self.card_type(card=card, acquired_turn=0)
+                )
+                self._log("Player {player} ({god}) received starting shrine card: {card}", player=player,
+                          god=self.selected_gods[player], card=card)
+
+        self.last_action = "Game starts! " + " vs ".join(f"Player {p} ({self.selected_gods[p]})" for p in self.players)
+
+        self._initialize_god_features()
+        self.emit("game_started")
+
+    def select_apollo_shrine(self, player, shrine_name):
+        """Called when Apollo player selects their starting shrine card"""
+
+        order = self.pool_order
+        for i in range(self.pool_pos, len(order)):
+            if SHRINE_IDS[order[i]] == shrine_name:
+                order[i], order[self.pool_pos] = order[self.pool_pos], order[i]
+                self.pool_pos += 1
+                break
+
+        self.shrine_cards[player].append(
+            self.card_type(card=shrine_name, acquired_turn=0)
+        )
+
+        self.emit("apollo_shrine_selected", player=player, card=shrine_name)
+        self._log("Player {player} (Apollo) selected starting shrine card: {card}", player=player, card=shrine_name)
+
+        self.apollo_players.remove(player)
+
+        if self.apollo_players:
+            self.current_selection_player = self.apollo_players[0]
+            self.last_action = f"Player {self.current_selection_player} (Apollo), choose your starting shrine card!"
+        else:
+
+            self._start_game()
+
+    def _initialize_god_features(self):
+        """Initialize special features for certain gods"""
+        for player in self.players:
+            if GOD_ABILITIES[self.god_ids[player]] == ABILITY_CLONE:
+                self.clone_turns[player] = None
+
+    def end_game(self, winner=None):
+        """End the current game and show winner"""
+        self.game_ended = True
+        self.winner = winner
+        self.emit("game_ended", winner=winner)
+        if winner:
+            self._announce("Game Over! Player {winner} ({god}) wins!", event="game_ended", winner=winner,
+                           god=self.selected_gods[winner])
+        else:
+            self._announce("Game Over! It's a tie!", event="game_ended", winner=winner)
+
+    def reset_game(self):
+        """Reset to a fresh game state with a new seed; outside listeners are dropped as before"""
+        self.listeners.clear()
+        self.refill_orders = None
+        self._reset(None)
+
+    def use_god_ability(self):
+        """Use the main god's permanent blessing ability"""
+        p = self.current_player
+        god = self.selected_gods[p]
+
+        if not god:
+            return
+
+        self.ABILITY_HANDLERS[GOD_ABILITIES[self.god_ids[p]]](self, p, god)
+
+    def _use_active_ability(self, p, god):
+        """Spend a recharging blessing; an attempt while it recharges is shown but not logged"""
+        if not self.god_ability_ready[p]:
+            turns_left = self.ability_ready_turn[p] - self.turn_number
+            self.last_action = f"Player {p}'s {god} ability not ready! {turns_left} turns left."
+            return
+
+        #a turn is one player's turn, so a cooldown of 3 is back on the owner's second turn after use
+        cooldown = GOD_COOLDOWNS[self.god_ids[p]]
+        self.god_ability_ready[p] = False
+        self.ability_ready_turn[p] = self.turn_number + cooldown
+        self.effects.schedule(self.ability_ready_turn[p], RECHARGE, p)
+        self.emit("ability_used", player=p, god=god)
+        self._announce("Player {player} used {god}'s ability! (Recharges in {cooldown} turns)", player=p, god=god,
+                       cooldown=cooldown)
+
+    def _toggle_clone(self, p, god):
+        if self.clone_turns[p] is None:
+            self.clone_turns[p] = self.turn_number
+            lifetime = GOD_CLONE_LIFETIMES[self.god_ids[p]]
+            if lifetime:
+                self.effects.schedule(self.turn_number + lifetime, CLONE_EXPIRES, p)
+            self.emit("clone_spawned", player=p)
+            if lifetime:
+                self._announce("Player {player} spawned {god} clone! (Active for {lifetime} turns)", player=p,
+                               god=god, lifetime=lifetime)
+            else:
+                self._announce("Player {player} spawned {god} clone! (Active until despawned)", player=p, god=god)
+        else:
+            self.clone_turns[p] = None
+            self.emit("clone_despawned", player=p)
+            self._announce("Player {player} despawned {god} clone!", player=p, god=god)
+
+    def _passive_ability(self, p, god):
+        self._announce("Player {player} has {blessing} (always active)", player=p, god=god,
+                       blessing=GOD_BLESSINGS[self.god_ids[p]])
+
+    #handler(self, player, god) indexed by ability kind
+    ABILITY_HANDLERS = [None] * 3
+    ABILITY_HANDLERS[ABILITY_PASSIVE] = _passive_ability
+    ABILITY_HANDLERS[ABILITY_ACTIVE] = _use_active_ability
+    ABILITY_HANDLERS[ABILITY_CLONE] = _toggle_clone
+
+    def select_shrine(self, player, index):
+        cards = self.shrine_cards[player]
+        if 0 <= index < len(cards):
+            if cards[index].acquired_turn < self.turn_number:
+                self.selected_shrine[player] = index
+                self.emit("shrine_selected", player=player, index=index)
+                self._announce("Player {player} selected shrine card {card}", player=player, index=index,
+                               card=cards[index].card)
+            else:
+                self._announce("Player {player} cannot select that shrine yet (not usable this turn)", WARNING,
+                               player=player, index=index)
+
+    def pick_shrine(self):
+        if not self.pool_size:
+            self._refill_pool()
+
+        card = self._draw_from_pool()
+        self.shrine_cards[self.current_player].append(
+            self.card_type(card=card, acquired_turn=self.turn_number)
+        )
+        self.emit("shrine_picked", player=self.current_player, card=card)
+        self._announce("Player {player} picked shrine {card} (usable after this turn).", player=self.current_player,
+                       card=card)
+
+        if not self.pool_size:
+            self._refill_pool()
+            self._log("Shrine pool empty — refilling all shrine cards back into the pool.", event="pool_refilled")
+
+    def use_shrine_card(self):
+        p = self.current_player
+        cards = self.shrine_cards[p]
+
+        selected_index = self.selected_shrine[p]
+
+        if selected_index is not None and 0 <= selected_index < len(cards):
+            sc = cards[selected_index]
+            if sc.acquired_turn < self.turn_number:
+
+                god = self.selected_gods[p]
+                enhancement = f" ({god}-enhanced)" if GOD_FLAGS[self.god_ids[p]] & ENHANCES_SHRINES else ""
+
+                cards.pop(selected_index)
+                self.selected_shrine[p] = None
+                self.emit("shrine_used", player=p, card=sc.card, enhanced=bool(enhancement))
+                self._announce("Player {player} used shrine card {card}{enhancement} (one-time).", player=p,
+                               card=sc.card, enhancement=enhancement)
+            else:
+                self._announce("Player {player} cannot use that shrine card yet!", WARNING, player=p)
+        else:
+            eligible_index = None
+            for i, sc in enumerate(cards):
+                if sc.acquired_turn < self.turn_number:
+                    eligible_index = i
+                    break
+
+            if eligible_index is None:
+                self._announce("Player {player} has no shrine card usable right now.", WARNING, player=p)
+                return
+
+            god = self.selected_gods[p]
+            enhancement = f" ({god}-enhanced)" if GOD_FLAGS[self.god_ids[p]] & ENHANCES_SHRINES else ""
+            sc = cards.pop(eligible_index)
+            self.emit("shrine_used", player=p, card=sc.card, enhanced=bool(enhancement))
+            self._announce("Player {player} used shrine card {card}{enhancement} (one-time).", player=p,
+                           card=sc.card, enhancement=enhancement)
+
+    def end_turn(self):
+        self.selected_shrine[self.current_player] = None
+
+        self.current_player = self.current_player % self.player_count + 1
+        self.turn_number += 1
+        for kind, p in self.effects.pop_due(self.turn_number):
+            self.EFFECT_HANDLERS[kind](self, p)
+        self.emit("turn_ended", player=self.current_player, turn=self.turn_number)
+        self._announce("Switched to Player {player} (Turn {turn}).", player=self.current_player)
+
+    def _recharge(self, p):
+        if not self.god_ability_ready[p] and self.ability_ready_turn[p] == self.turn_number:
+            self.god_ability_ready[p] = True
+            self.emit("ability_recharged", player=p, god=self.selected_gods[p])
+
+    def _expire_clone(self, p):
+        spawned = self.clone_turns[p]
+        if spawned is not None and spawned + GOD_CLONE_LIFETIMES[self.god_ids[p]] == self.turn_number:
+            self.clone_turns[p] = None
+            self.emit("clone_expired", player=p)
+
+    #handler(self, player) indexed by effect kind
+    EFFECT_HANDLERS = [None] * 2
+    EFFECT_HANDLERS[RECHARGE] = _recharge
+    EFFECT_HANDLERS[CLONE_EXPIRES] = _expire_clone
+
+    def _shuffle_pool(self):
+        """Refill pool_order in place from the next pre-generated order or a fresh shuffle"""
+        self.pool_pos = 0
+        if self.refill_orders is not None:
+            self.pool_order[:] = bytes(next(self.refill_orders))
+        else:
+            self.pool_order[:] = SHRINE_ORDER
+            self.rng.shuffle(self.pool_order)
+
+    def _refill_pool(self):
+        self._shuffle_pool()
+        self.emit("pool_refilled")
@@ -0,0 +1,124 @@
+"""Structured, buffered logging for the game engine.
+
+log() appends a (timestamp, level, message, fields) record to a bounded ring
+buffer and returns. Messages are format templates filled from the fields
+only when a sink writes them. Sinks run when flush() is called: once per
+frame by the pygame loop, or at exit. A full buffer drops its oldest records
+and counts them in dropped. NULL_LOGGER discards everything and is what
+quiet engines use, so disabled logging costs one method call.
+"""
+import atexit
+import json
+import sys
+import time
+from collections import deque
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+def format_message(message, fields):
+    return message.format(**fields) if fields else message
+
+class ConsoleSink:
+    """Writes plain messages, one write per flush, like the old print calls"""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def write(self, records):
+        stream = self.stream or sys.stdout
+        stream.write("".join(format_message(message, fields) + "\n" for _, _, message, fields in records))
+        stream.flush()
+
+class JsonLinesSink:
+    """Appends one JSON object per record, for the replay and analytics pipeline"""
+
+    def __init__(self, path):
+        self.file = open(path, "a")
+
+    def write(self, records):
+        for created, level, message, fields in records:
+            entry = {"ts": created, "level": LEVEL_NAMES.get(level, level), "msg": format_message(message, fields)}
+            entry.update(fields)
+            self.file.write(json.dumps(entry, default=str) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class CallbackSink:
+    """Hands each flushed batch of raw records to a callable"""
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def write(self, records):
+        self.callback(records)
+
+class GameLogger:
+    def __init__(self, level=INFO, capacity=4096, sinks=None):
+        self.level = level
+        self.buffer = deque(maxlen=capacity)
+        self.sinks = list(sinks) if sinks is not None else []
+        self.dropped = 0
+
+    def enabled(self, level):
+        return level >= self.level
+
+    def log(self, level, message, **fields):
+        if level < self.level:
+            return
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1
+        self.buffer.append((time.time(), level, message, fields))
+
+    def debug(self, message, **fields):
+        self.log(DEBUG, message, **fields)
+
+    def info(self, message, **fields):
+        self.log(INFO, message, **fields)
+
+    def warning(self, message, **fields):
+        self.log(WARNING, message, **fields)
+
+    def error(self, message, **fields):
+        self.log(ERROR, message, **fields)
+
+    def flush(self):
+        """Hand every buffered record to the sinks and empty the buffer"""
+        if not self.buffer:
+            return
+        records = list(self.buffer)
+        self.buffer.clear()
+        for sink in self.sinks:
+            sink.write(records)
+
+class NullLogger:
+    level = ERROR + 1
+    dropped = 0
+
+    def enabled(self, level):
+        return False
+
+    def log(self, *args, **fields):
+        pass
+
+    debug = info = warning = error = log
+
+    def flush(self):
+        pass
+
+NULL_LOGGER = NullLogger()
+
+_console_logger = None
+
+def console_logger():
+    """Shared logger writing to stdout, flushed at exit if nobody flushed it earlier"""
+    global _console_logger
+    if _console_logger is None:
+        _console_logger = GameLogger(sinks=[ConsoleSink()])
+        atexit.register(_console_logger.flush)
+    return _console_logger
@@ -1,19 +1,41 @@
+import time
+#taken before pygame is imported so the startup report covers the whole cold start
+STARTED_AT = time.perf_counter()
+
 import pygame
 import sys
-import random
 import math
 import asyncio
 import platform
+import numpy as np
+from collections import OrderedDict
+
+import engine
+from engine import GameEngine, SHRINE_IDS, AVAILABLE_GODS, GOD_DESCRIPTIONS, GOD_FLAGS, GOD_COOLDOWNS, ENHANCES_SHRINES
+from profiler import FrameProfiler
+from ai import AIPlayer
 
 #platform detection for web-specific behavior
 RUNNING_IN_BROWSER = sys.platform == "emscripten"
 
-pygame.init()
-
 WIDTH, HEIGHT = 1080, 720
-WIN = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
-pygame.display.set_caption("God's Gauntlet - Enhanced")
+#created by create_window() when main() starts, so importing this module opens nothing
+WIN = None
 FPS = 60
+#frame rate used while nothing on screen is animating
+IDLE_FPS = 5
+#minimum gap between accepted clicks on the same target
+SELECTION_DEBOUNCE_MS = 200
+SHRINE_DEBOUNCE_MS = 150
+#repaint only changed regions of the playing screen; set to False for full redraws
+DIRTY_RECT_RENDERING = True
+#F3 toggles the frame profiler overlay, F4 writes its Chrome trace here
+TRACE_PATH = "frame_trace.json"
+#F2 hands this seat to the search AI; it thinks for AI_BUDGET seconds per move, in a thread natively
+#and in AI_SLICE slices between browser frames
+AI_PLAYER = 2
+AI_BUDGET = 0.4
+AI_SLICE = 0.008
 
 WHITE = (255, 255, 255)
 LIGHT_GRAY = (240, 240, 245)
@@ -37,314 +59,258 @@ PLAYER_COLORS = {
     2: PURPLE 
 }
 
-FONT_SMALL = pygame.font.SysFont(None, 20)
-FONT = pygame.font.SysFont(None, 28)
-BIG = pygame.font.SysFont(None, 38)
-HUGE = pygame.font.SysFont(None, 48)
+class LazyFont:
+    """Stands in for a pygame Font and loads it the first time it is used.
 
-BUTTON_W, BUTTON_H = 250, 50
-MENU_BUTTON_W, MENU_BUTTON_H = 140, 40
+    Uses the bundled default font through pygame.font.Font rather than
+    SysFont, which scans the system font list before falling back to it.
+    """
 
-SHRINE_IDS = ["Athena", "Ares", "Hephaestus", "Hermes", "Hera", "Apollo", "Hestia", "Artemis", "Demeter", "Athena", "Ares", "Hephaestus", "Hermes", "Hera", "Apollo", "Hestia", "Artemis", "Demeter"]
-SHRINE_COUNT = len(SHRINE_IDS)
-
-AVAILABLE_GODS = ["Athena", "Ares", "Hephaestus", "Hermes", "Hera", "Apollo", "Hestia", "Artemis", "Demeter"]
-
-GOD_DESCRIPTIONS = {
-    "Athena": "Move 2 walls every 3 turns",
-    "Ares": "Break walls while moving every 3 turns",
-    "Hephaestus": "Add walls every 3 turns",
-    "Hermes": "Move 2 spaces every 3 turns",
-    "Hera": "Spawn a controllable clone",
-    "Apollo": "See next shrine card always",
-    "Hestia": "Draw shrine cards every 3 turns",
-    "Artemis": "Place traps every 3 turns",
-    "Demeter": "Enhance all shrine cards"
-}
+    def __init__(self, point_size):
+        self.point_size = point_size
+        self.font = None
 
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.vx = random.uniform(-3, 3)
-        self.vy = random.uniform(-5, -1)
-        self.life = 60
-        self.max_life = 60
-        self.color = color
-        self.size = random.randint(3, 7)
+    def load(self):
+        if self.font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self.font = pygame.font.Font(None, self.point_size)
+        return self.font
 
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += 0.2  
-        self.life -= 1
+    def render(self, text, antialias, color, background=None):
+        return self.load().render(text, antialias, color, background)
 
-    def draw(self, surface):
-        alpha = int(255 * (self.life / self.max_life))
-        size = int(self.size * (self.life / self.max_life))
-        if size > 0:
-            s = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-            color_with_alpha = self.color + (alpha,)
-            pygame.draw.circle(s, color_with_alpha, (size, size), size)
-            surface.blit(s, (int(self.x - size), int(self.y - size)))
-
-class ShrineCard:
-    def __init__(self, card, acquired_turn):
-        self.card = card
-        self.acquired_turn = acquired_turn
-        self.hover_scale = 0.0
-        self.glow = 0.0
+    def size(self, text):
+        return self.load().size(text)
 
-class GameState:
-    def __init__(self):
-        self.game_stage = "god_selection"  
-        self.current_selection_player = 1
-        self.selected_gods = {1: None, 2: None}
-        self.apollo_players = []  
-
-        self.current_player = 1
-        self.turn_number = 1
-
-        self.god_ability_counters = {1: 0, 2: 0}
-        self.god_ability_ready = {1: True, 2: True}  
-
-        self.shrine_pool = SHRINE_IDS.copy()
-        random.shuffle(self.shrine_pool)
-        self.shrine_cards = {1: [], 2: []}
-        self.selected_shrine = {1: None, 2: None}
-        self.last_action = "Select your main god!"
-        self.is_fullscreen = False
-        self.particles = []
-        self.turn_transition_alpha = 0
-        self.action_flash = 0
-
-        self.clones = {1: None, 2: None}
-        self.game_ended = False
-        self.winner = None  
+    def __getattr__(self, name):
+        return getattr(self.load(), name)
 
-    def select_god(self, player, god_name):
-        """Called during god selection phase"""
-        self.selected_gods[player] = god_name
-        self.spawn_particles(WIDTH // 2, HEIGHT // 2, PLAYER_COLORS[player])
+FONT_SMALL = LazyFont(20)
+FONT = LazyFont(28)
+BIG = LazyFont(38)
+HUGE = LazyFont(48)
 
-        if god_name == "Apollo":
-            self.apollo_players.append(player)
+BUTTON_W, BUTTON_H = 250, 50
+SHRINE_ROW_H = 40
+#clamped to the bottom of the list the next time the list is laid out
+SCROLL_TO_END = 1 << 30
+MENU_BUTTON_W, MENU_BUTTON_H = 140, 40
 
-        if player == 1:
-            self.current_selection_player = 2
-            self.last_action = "Player 2, select your god!"
+class ParticleSystem:
+    """Pooled particle engine backed by preallocated NumPy arrays.
+
+    Live particles occupy slots in fixed-size arrays; dead slots go back on a
+    free list so bursts never allocate per-particle objects.
+    """
+    BURST_SIZE = 20
+    MAX_LIFE = 60
+    GRAVITY = 0.2
+
+    def __init__(self, capacity=1024, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.capacity = 0
+        self.count = 0
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        old = self.capacity
+        pos = np.zeros((capacity, 2), dtype=np.float32)
+        vel = np.zeros((capacity, 2), dtype=np.float32)
+        life = np.zeros(capacity, dtype=np.int16)
+        size = np.zeros(capacity, dtype=np.int16)
+        color = np.zeros((capacity, 3), dtype=np.uint8)
+        if old:
+            pos[:old] = self.pos
+            vel[:old] = self.vel
+            life[:old] = self.life
+            size[:old] = self.size
+            color[:old] = self.color
+            free = np.concatenate((self.free[:self.free_top], np.arange(capacity - 1, old - 1, -1, dtype=np.int32)))
         else:
+            free = np.arange(capacity - 1, -1, -1, dtype=np.int32)
+        self.pos, self.vel, self.life, self.size, self.color = pos, vel, life, size, color
+        self.free = np.empty(capacity, dtype=np.int32)
+        self.free_top = len(free)
+        self.free[:self.free_top] = free
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def spawn(self, x, y, color, n=BURST_SIZE):
+        if n > self.free_top:
+            self._grow(max(self.capacity * 2, self.count + n))
+
+        self.free_top -= n
+        slots = self.free[self.free_top:self.free_top + n]
+
+        self.pos[slots] = (x, y)
+        self.vel[slots, 0] = self.rng.uniform(-3, 3, n)
+        self.vel[slots, 1] = self.rng.uniform(-5, -1, n)
+        self.life[slots] = self.MAX_LIFE
+        self.size[slots] = self.rng.integers(3, 8, n)
+        self.color[slots] = color
+        self.count += n
 
-            if self.apollo_players:
-                self.game_stage = "apollo_selection"
-                self.current_selection_player = self.apollo_players[0]
-                self.last_action = f"Player {self.current_selection_player} (Apollo), choose your starting shrine card!"
-            else:
-                self._start_game()
-
-        print(f"Player {player} selected {god_name}")
-
-    def _start_game(self):
-        """Initialize the game after all selections are complete"""
-        self.game_stage = "playing"
-
-        for player in [1, 2]:
-            if self.selected_gods[player] == "Demeter":
-                if not self.shrine_pool:
-                    self._refill_pool()
-                card = self.shrine_pool.pop()
-                self.shrine_cards[player].append(
-                    ShrineCard(card=card, acquired_turn=0)  
-                )
-                print(f"Player {player} (Demeter) received starting shrine card: {card}")
-
-        self.last_action = f"Game starts! Player 1 ({self.selected_gods[1]}) vs Player 2 ({self.selected_gods[2]})"
-
-        self._initialize_god_features()
-
-    def select_apollo_shrine(self, player, shrine_name):
-        """Called when Apollo player selects their starting shrine card"""
-
-        if shrine_name in self.shrine_pool:
-            self.shrine_pool.remove(shrine_name)
-
-        self.shrine_cards[player].append(
-            ShrineCard(card=shrine_name, acquired_turn=0)  
-        )
+    def update(self):
+        if not self.count:
+            return
 
-        self.spawn_particles(WIDTH // 2, HEIGHT // 2, GOLD)
-        print(f"Player {player} (Apollo) selected starting shrine card: {shrine_name}")
+        live = self.life > 0
+        self.pos[live] += self.vel[live]
+        self.vel[live, 1] += self.GRAVITY
+        self.life[live] -= 1
+
+        expired = np.flatnonzero(live & (self.life <= 0)).astype(np.int32)
+        if len(expired):
+            self.free[self.free_top:self.free_top + len(expired)] = expired
+            self.free_top += len(expired)
+            self.count -= len(expired)
+
+    def live_slots(self):
+        return np.flatnonzero(self.life > 0)
+
+    def clear(self):
+        self.life[:] = 0
+        self.count = 0
+        self.free_top = self.capacity
+        self.free[:] = np.arange(self.capacity - 1, -1, -1, dtype=np.int32)
+
+class ParticleSpriteCache:
+    """LRU cache of pre-rendered particle circles keyed by (colour, radius, alpha bucket)"""
+    ALPHA_BUCKETS = 16
+
+    def __init__(self, max_sprites=512):
+        self.max_sprites = max_sprites
+        self.sprites = OrderedDict()
+
+    def get(self, color, radius, bucket):
+        key = (color, radius, bucket)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            return sprite
+
+        alpha = min(255, (bucket + 1) * 256 // self.ALPHA_BUCKETS)
+        sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color + (alpha,), (radius, radius), radius)
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.max_sprites:
+            self.sprites.popitem(last=False)
+        return sprite
+
+PARTICLE_SPRITES = ParticleSpriteCache()
+
+def draw_particles(surface, particles):
+    """Draw every live particle from the sprite cache with a single blits call"""
+    slots = particles.live_slots()
+    if not len(slots):
+        return
+
+    ratio = particles.life[slots] / particles.MAX_LIFE
+    sizes = (particles.size[slots] * ratio).astype(np.int64)
+    visible = sizes > 0
+    slots, ratio, sizes = slots[visible], ratio[visible], sizes[visible]
+    if not len(slots):
+        return
+    buckets = (ratio * (ParticleSpriteCache.ALPHA_BUCKETS - 1)).astype(np.int64)
+    xs = (particles.pos[slots, 0] - sizes).astype(np.int32)
+    ys = (particles.pos[slots, 1] - sizes).astype(np.int32)
+    colors = particles.color[slots].astype(np.int64)
+
+    #pack (colour, size, bucket) into one key so each distinct sprite is looked up once
+    keys = (((colors[:, 0] << 16 | colors[:, 1] << 8 | colors[:, 2]) * 256 + sizes) << 4) | buckets
+    unique, inverse = np.unique(keys, return_inverse=True)
+    get = PARTICLE_SPRITES.get
+    sprites = np.empty(len(unique), dtype=object)
+    for i, key in enumerate(unique.tolist()):
+        color = key >> 12
+        sprites[i] = get((color >> 16, color >> 8 & 0xFF, color & 0xFF), key >> 4 & 0xFF, key & 0xF)
+
+    surface.blits(zip(sprites[inverse].tolist(), zip(xs.tolist(), ys.tolist())), doreturn=False)
+
+#particle colour and action-bar flash for each engine event; None means the acting player's colour
+EVENT_EFFECTS = {
+    "god_selected": (None, False),
+    "apollo_shrine_selected": (GOLD, False),
+    "game_ended": (GOLD, True),
+    "ability_used": (GOLD, True),
+    "clone_spawned": (GOLD, True),
+    "clone_despawned": (GRAY, True),
+    "clone_expired": (GRAY, True),
+    "shrine_selected": (None, True),
+    "shrine_picked": (ORANGE, True),
+    "shrine_used": (CYAN, True),
+    "turn_ended": (None, False)
+}
 
-        self.apollo_players.remove(player)
+class ShrineCard(engine.ShrineCard):
+    #animation state only; the rules never read it
+    __slots__ = ("hover_scale", "glow")
 
-        if self.apollo_players:
-            self.current_selection_player = self.apollo_players[0]
-            self.last_action = f"Player {self.current_selection_player} (Apollo), choose your starting shrine card!"
-        else:
-
-            self._start_game()
+    def __init__(self, card, acquired_turn):
+        super().__init__(card, acquired_turn)
+        self.hover_scale = 0.0
+        self.glow = 0.0
 
-    def _initialize_god_features(self):
-        """Initialize special features for certain gods"""
-        for player in [1, 2]:
-            god = self.selected_gods[player]
-            if god == "Hera":
+class GameState(GameEngine):
+    """Pygame front end state: the rules engine plus particles, fades and window mode.
 
-                self.clones[player] = None
+    Everything declared here is presentation state. Snapshots, replays and
+    the server only ever see the GameEngine slots.
+    """
+    __slots__ = ("is_fullscreen", "particles", "turn_transition_alpha", "action_flash", "shrine_scroll", "hover_cards")
+    card_type = ShrineCard
 
-    def end_game(self, winner=None):
-        """End the current game and show winner"""
-        self.game_ended = True
-        self.winner = winner
-        if winner:
-            self.last_action = f"Game Over! Player {winner} ({self.selected_gods[winner]}) wins!"
-        else:
-            self.last_action = "Game Over! It's a tie!"
-        self.action_flash = 30
-        self.spawn_particles(WIDTH // 2, HEIGHT // 2, GOLD)
-        print(self.last_action)
+    def __init__(self, verbose=True, seed=None, logger=None):
+        super().__init__(verbose, seed, logger=logger)
+        self.is_fullscreen = False
+        self.particles = ParticleSystem(rng=np.random.default_rng(self.cosmetic_rng.next_u64()))
+        #shrine list scroll offsets in pixels, and the cards whose hover animation has not settled
+        self.shrine_scroll = [0, 0, 0]
+        self.hover_cards = [None, set(), set()]
+        self._reset_effects()
+        self.subscribe(self._on_event)
+
+    def _reset_effects(self):
+        self.particles.clear()
+        self.turn_transition_alpha = 0
+        self.action_flash = 0
+        for p in [1, 2]:
+            self.shrine_scroll[p] = 0
+            self.hover_cards[p].clear()
 
     def reset_game(self):
-        """Reset to a fresh game state"""
-        self.__init__()
-
-    def use_god_ability(self):
-        """Use the main god's permanent blessing ability"""
-        p = self.current_player
-        god = self.selected_gods[p]
+        super().reset_game()
+        self._reset_effects()
+        self.subscribe(self._on_event)
 
-        if not god:
+    def _on_event(self, event, data):
+        effect = EVENT_EFFECTS.get(event)
+        if effect is None:
             return
 
-        if god in ["Athena", "Ares", "Hephaestus", "Hermes", "Hestia", "Artemis"]:
-            if not self.god_ability_ready[p]:
-                turns_left = 6 - self.god_ability_counters[p]
-                self.last_action = f"Player {p}'s {god} ability not ready! {turns_left} turns left."
-                return
-
-            self.god_ability_ready[p] = False
-            self.god_ability_counters[p] = 0
-            self.last_action = f"Player {p} used {god}'s ability! (Recharges in 6 turns)"
+        color, flash = effect
+        if color is None:
+            color = PLAYER_COLORS[data["player"]]
+        if flash:
             self.action_flash = 30
-            self.spawn_particles(WIDTH // 2, HEIGHT // 2, GOLD)
 
-        elif god == "Hera":
+        if event == "shrine_picked":
+            #bring the new card, which joins the end of the hand, into view
+            self.shrine_scroll[data["player"]] = SCROLL_TO_END
 
-            if self.clones[p] is None:
-                self.clones[p] = {"turns_active": 0}
-                self.last_action = f"Player {p} spawned Hera clone! (Active until despawned)"
-                self.action_flash = 30
-                self.spawn_particles(WIDTH // 2, HEIGHT // 2, GOLD)
-            else:
-                self.clones[p] = None
-                self.last_action = f"Player {p} despawned Hera clone!"
-                self.action_flash = 30
-                self.spawn_particles(WIDTH // 2, HEIGHT // 2, GRAY)
-
-        elif god == "Apollo":
-            self.last_action = f"Player {p} has Apollo's sight (always active)"
-
-        elif god == "Demeter":
-            self.last_action = f"Player {p} has Demeter's enhancement (always active)"
-
-        print(self.last_action)
-
-    def select_shrine(self, player, index):
-        cards = self.shrine_cards[player]
-        if 0 <= index < len(cards):
-            if cards[index].acquired_turn < self.turn_number:
-                self.selected_shrine[player] = index
-                self.last_action = f"Player {player} selected shrine card {cards[index].card}"
-                self.action_flash = 30
-                self.spawn_particles(400, 300, PLAYER_COLORS[player])
-                print(self.last_action)
-            else:
-                self.last_action = f"Player {player} cannot select that shrine yet (not usable this turn)"
-                print(self.last_action)
-
-    def pick_shrine(self):
-        if not self.shrine_pool:
-            self._refill_pool()
-
-        card = self.shrine_pool.pop()
-        self.shrine_cards[self.current_player].append(
-            ShrineCard(card=card, acquired_turn=self.turn_number)
-        )
-        self.last_action = f"Player {self.current_player} picked shrine {card} (usable after this turn)."
-        self.action_flash = 30
-        self.spawn_particles(WIDTH // 2, HEIGHT // 2, ORANGE)
-        print(self.last_action)
-
-        if not self.shrine_pool:
-            self._refill_pool()
-            print("Shrine pool empty — refilling all shrine cards back into the pool.")
-
-    def use_shrine_card(self):
-        p = self.current_player
-        cards = self.shrine_cards[p]
-
-        selected_index = self.selected_shrine[p]
-
-        if selected_index is not None and 0 <= selected_index < len(cards):
-            sc = cards[selected_index]
-            if sc.acquired_turn < self.turn_number:
-
-                god = self.selected_gods[p]
-                enhancement = " (Demeter-enhanced)" if god == "Demeter" else ""
-
-                cards.pop(selected_index)
-                self.selected_shrine[p] = None
-                self.last_action = f"Player {p} used shrine card {sc.card}{enhancement} (one-time)."
-                self.action_flash = 30
-                self.spawn_particles(WIDTH // 2, HEIGHT // 2, CYAN)
-                print(self.last_action)
-            else:
-                self.last_action = f"Player {p} cannot use that shrine card yet!"
-                print(self.last_action)
+        if event == "shrine_selected":
+            self.spawn_particles(400, 300, color)
         else:
-            eligible_index = None
-            for i, sc in enumerate(cards):
-                if sc.acquired_turn < self.turn_number:
-                    eligible_index = i
-                    break
-
-            if eligible_index is None:
-                self.last_action = f"Player {p} has no shrine card usable right now."
-                print(self.last_action)
-                return
-
-            god = self.selected_gods[p]
-            enhancement = " (Demeter-enhanced)" if god == "Demeter" else ""
-            sc = cards.pop(eligible_index)
-            self.last_action = f"Player {p} used shrine card {sc.card}{enhancement} (one-time)."
-            self.action_flash = 30
-            self.spawn_particles(WIDTH // 2, HEIGHT // 2, CYAN)
-            print(self.last_action)
-
-    def end_turn(self):
-
-        for p in [1, 2]:
-            if not self.god_ability_ready[p]:
-                self.god_ability_counters[p] += 1
-                if self.god_ability_counters[p] >= 3:
-                    self.god_ability_ready[p] = True
-                    self.god_ability_counters[p] = 0
-
-            if self.clones[p] is not None:
-                self.clones[p]["turns_active"] += 1
-
-        self.selected_shrine[self.current_player] = None
+            self.spawn_particles(WIDTH // 2, HEIGHT // 2, color)
 
-        self.current_player = 2 if self.current_player == 1 else 1
-        self.turn_number += 1
-        self.last_action = f"Switched to Player {self.current_player} (Turn {self.turn_number})."
-        self.turn_transition_alpha = 255
-        self.spawn_particles(WIDTH // 2, HEIGHT // 2, PLAYER_COLORS[self.current_player])
-        print(self.last_action)
-
-    def _refill_pool(self):
-        self.shrine_pool = SHRINE_IDS.copy()
-        random.shuffle(self.shrine_pool)
+        if event == "turn_ended":
+            self.turn_transition_alpha = 255
 
     def toggle_fullscreen(self, surface):
         if not RUNNING_IN_BROWSER:  # Fullscreen not supported in browser
@@ -356,14 +322,10 @@ class GameState:
         return surface
 
     def spawn_particles(self, x, y, color):
-        for _ in range(20):
-            self.particles.append(Particle(x, y, color))
+        self.particles.spawn(x, y, color)
 
     def update_particles(self):
-        for particle in self.particles[:]:
-            particle.update()
-            if particle.life <= 0:
-                self.particles.remove(particle)
+        self.particles.update()
 
         if self.turn_transition_alpha > 0:
             self.turn_transition_alpha -= 8
@@ -371,124 +333,200 @@ class GameState:
         if self.action_flash > 0:
             self.action_flash -= 1
 
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, colour, antialias)"""
+
+    def __init__(self, max_entries=1024, max_bytes=16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self.entries[key] = surf
+        self.bytes_used += surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+        while len(self.entries) > self.max_entries or (self.bytes_used > self.max_bytes and len(self.entries) > 1):
+            _, old = self.entries.popitem(last=False)
+            self.bytes_used -= old.get_width() * old.get_height() * old.get_bytesize()
+        return surf
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes_used = 0
+
+TEXT_CACHE = TextCache()
+PROFILER = FrameProfiler()
+
 def render_text(surface, text, pos, font=FONT, color=BLACK):
-    surf = font.render(text, True, color)
+    surf = TEXT_CACHE.render(font, text, color)
     surface.blit(surf, pos)
 
-def draw_apollo_selection_screen(surface, game, mouse_pos, width, height):
-    """Draw the Apollo shrine card selection interface"""
-
-    surface.fill(LIGHT_GRAY)
-
-    player = game.current_selection_player
-    title = HUGE.render(f"Player {player} (Apollo): Choose Starting Shrine", True, GOLD)
-    surface.blit(title, (width // 2 - title.get_width() // 2, 40))
-
-    subtitle = FONT.render("You may select any shrine card to start with", True, PLAYER_COLORS[player])
-    surface.blit(subtitle, (width // 2 - subtitle.get_width() // 2, 95))
-
+def get_selection_card_rects(names, card_height, start_y, width):
+    """Lay out selection cards three to a row, centred; return [(rect, name)]"""
     cards_per_row = 3
     card_width = 220
-    card_height = 100
     spacing = 20
     start_x = (width - (cards_per_row * card_width + (cards_per_row - 1) * spacing)) // 2
-    start_y = 160
 
-    shrine_rects = []
-
-    for i, shrine_name in enumerate(SHRINE_IDS):
+    rects = []
+    for i, name in enumerate(names):
         row = i // cards_per_row
         col = i % cards_per_row
-
         x = start_x + col * (card_width + spacing)
         y = start_y + row * (card_height + spacing)
+        rects.append((pygame.Rect(x, y, card_width, card_height), name))
+    return rects
 
-        card_rect = pygame.Rect(x, y, card_width, card_height)
-        shrine_rects.append((card_rect, shrine_name))
+def get_apollo_card_rects(width):
+    return get_selection_card_rects(SHRINE_IDS, 100, 160, width)
 
-        is_hovered = card_rect.collidepoint(mouse_pos)
+def get_god_card_rects(width):
+    return get_selection_card_rects(AVAILABLE_GODS, 140, 140, width)
 
-        if is_hovered:
-            pygame.draw.rect(surface, GOLD, card_rect, border_radius=12)
-            pygame.draw.rect(surface, YELLOW, card_rect, 4, border_radius=12)
-        else:
-            pygame.draw.rect(surface, WHITE, card_rect, border_radius=12)
-            pygame.draw.rect(surface, ORANGE, card_rect, 3, border_radius=12)
+def draw_apollo_card(surface, card_rect, shrine_name, is_hovered):
+    x, y, card_width, card_height = card_rect
 
-        name_surf = BIG.render(shrine_name, True, ORANGE)
-        name_x = x + card_width // 2 - name_surf.get_width() // 2
-        surface.blit(name_surf, (name_x, y + card_height // 2 - name_surf.get_height() // 2))
+    if is_hovered:
+        pygame.draw.rect(surface, GOLD, card_rect, border_radius=12)
+        pygame.draw.rect(surface, YELLOW, card_rect, 4, border_radius=12)
+    else:
+        pygame.draw.rect(surface, WHITE, card_rect, border_radius=12)
+        pygame.draw.rect(surface, ORANGE, card_rect, 3, border_radius=12)
+
+    name_surf = TEXT_CACHE.render(BIG, shrine_name, ORANGE)
+    name_x = x + card_width // 2 - name_surf.get_width() // 2
+    surface.blit(name_surf, (name_x, y + card_height // 2 - name_surf.get_height() // 2))
+
+def wrap_text(text, font, max_width):
+    lines = []
+    current_line = ""
+    for word in text.split():
+        test_line = current_line + word + " "
+        if font.size(test_line)[0] < max_width:
+            current_line = test_line
+        else:
+            if current_line:
+                lines.append(current_line)
+            current_line = word + " "
+    if current_line:
+        lines.append(current_line)
+    return lines
+
+def draw_god_card(surface, card_rect, god_name, player, is_hovered):
+    x, y, card_width, card_height = card_rect
+
+    if is_hovered:
+        pygame.draw.rect(surface, YELLOW, card_rect, border_radius=12)
+        pygame.draw.rect(surface, GOLD, card_rect, 4, border_radius=12)
+    else:
+        pygame.draw.rect(surface, WHITE, card_rect, border_radius=12)
+        pygame.draw.rect(surface, PLAYER_COLORS[player], card_rect, 3, border_radius=12)
 
-    for particle in game.particles:
-        particle.draw(surface)
+    name_surf = TEXT_CACHE.render(BIG, god_name, PLAYER_COLORS[player])
+    name_x = x + card_width // 2 - name_surf.get_width() // 2
+    surface.blit(name_surf, (name_x, y + 15))
 
-    pygame.display.update()
+    for j, line in enumerate(wrap_text(GOD_DESCRIPTIONS[god_name], FONT_SMALL, card_width - 20)):
+        line_surf = TEXT_CACHE.render(FONT_SMALL, line.strip(), BLACK)
+        line_x = x + card_width // 2 - line_surf.get_width() // 2
+        surface.blit(line_surf, (line_x, y + 55 + j * 22))
 
-    return shrine_rects
-
-def draw_god_selection_screen(surface, game, mouse_pos, width, height):
-    """Draw the god selection interface"""
+def draw_apollo_title(surface, player, width):
+    title = TEXT_CACHE.render(HUGE, f"Player {player} (Apollo): Choose Starting Shrine", GOLD)
+    surface.blit(title, (width // 2 - title.get_width() // 2, 40))
 
-    surface.fill(LIGHT_GRAY)
+    subtitle = TEXT_CACHE.render(FONT, "You may select any shrine card to start with", PLAYER_COLORS[player])
+    surface.blit(subtitle, (width // 2 - subtitle.get_width() // 2, 95))
 
-    player = game.current_selection_player
-    title = HUGE.render(f"Player {player}: Choose Your God", True, PLAYER_COLORS[player])
+def draw_god_title(surface, player, width):
+    title = TEXT_CACHE.render(HUGE, f"Player {player}: Choose Your God", PLAYER_COLORS[player])
     surface.blit(title, (width // 2 - title.get_width() // 2, 40))
 
-    cards_per_row = 3
-    card_width = 220
-    card_height = 140
-    spacing = 20
-    start_x = (width - (cards_per_row * card_width + (cards_per_row - 1) * spacing)) // 2
-    start_y = 140
+class SelectionLayerCache:
+    """Pre-composed layers for the god and Apollo selection screens.
 
-    god_rects = []
+    Each screen is a full-size card layer with every card in its resting
+    state, a title strip per selecting player, and one hover layer per card,
+    built the first time that card is hovered. A frame is then a couple of
+    blits. Everything is dropped when the window size changes. God cards are
+    drawn in the chooser's colour, so their card and hover layers are also
+    kept per player. Apollo cards are the same for both players.
+    """
 
-    for i, god_name in enumerate(AVAILABLE_GODS):
-        row = i // cards_per_row
-        col = i % cards_per_row
+    def __init__(self):
+        self.size = None
+        self.layers = {}
+
+    def _layer(self, key, size, draw):
+        layer = self.layers.get(key)
+        if layer is None:
+            layer = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                layer = layer.convert()
+            layer.fill(LIGHT_GRAY)
+            draw(layer)
+            self.layers[key] = layer
+        return layer
+
+    def draw(self, surface, screen, player, cards, draw_card, draw_title, mouse_pos, width, height):
+        """Blit one selection screen from its layers; cards is [(rect, name)] in screen order"""
+        if self.size != (width, height):
+            self.size = (width, height)
+            self.layers.clear()
+        card_player = player if screen == 'god' else None
+
+        def draw_cards(layer):
+            for card_rect, name in cards:
+                draw_card(layer, card_rect, name, False)
+
+        surface.blit(self._layer((screen, 'cards', card_player), (width, height), draw_cards), (0, 0))
+        #the title strip ends where the first row of cards starts
+        surface.blit(self._layer((screen, 'title', player), (width, cards[0][0].y),
+                                 lambda layer: draw_title(layer, player, width)), (0, 0))
+
+        for i, (card_rect, name) in enumerate(cards):
+            if card_rect.collidepoint(mouse_pos):
+                local_rect = pygame.Rect((0, 0), card_rect.size)
+                hover = self._layer((screen, 'hover', card_player, i), card_rect.size,
+                                    lambda layer: draw_card(layer, local_rect, name, True))
+                surface.blit(hover, card_rect)
+                break
+
+SELECTION_LAYERS = SelectionLayerCache()
 
-        x = start_x + col * (card_width + spacing)
-        y = start_y + row * (card_height + spacing)
+def draw_apollo_selection_screen(surface, game, mouse_pos, width, height):
+    """Draw the Apollo shrine card selection interface"""
+    shrine_rects = get_apollo_card_rects(width)
+    SELECTION_LAYERS.draw(surface, 'apollo', game.current_selection_player, shrine_rects,
+                          draw_apollo_card, draw_apollo_title, mouse_pos, width, height)
 
-        card_rect = pygame.Rect(x, y, card_width, card_height)
-        god_rects.append((card_rect, god_name))
+    draw_particles(surface, game.particles)
 
-        is_hovered = card_rect.collidepoint(mouse_pos)
+    pygame.display.update()
 
-        if is_hovered:
-            pygame.draw.rect(surface, YELLOW, card_rect, border_radius=12)
-            pygame.draw.rect(surface, GOLD, card_rect, 4, border_radius=12)
-        else:
-            pygame.draw.rect(surface, WHITE, card_rect, border_radius=12)
-            pygame.draw.rect(surface, PLAYER_COLORS[player], card_rect, 3, border_radius=12)
-
-        name_surf = BIG.render(god_name, True, PLAYER_COLORS[player])
-        name_x = x + card_width // 2 - name_surf.get_width() // 2
-        surface.blit(name_surf, (name_x, y + 15))
-
-        desc = GOD_DESCRIPTIONS[god_name]
-        desc_lines = []
-        words = desc.split()
-        current_line = ""
-        for word in words:
-            test_line = current_line + word + " "
-            if FONT_SMALL.size(test_line)[0] < card_width - 20:
-                current_line = test_line
-            else:
-                if current_line:
-                    desc_lines.append(current_line)
-                current_line = word + " "
-        if current_line:
-            desc_lines.append(current_line)
+    return shrine_rects
 
-        for j, line in enumerate(desc_lines):
-            line_surf = FONT_SMALL.render(line.strip(), True, BLACK)
-            line_x = x + card_width // 2 - line_surf.get_width() // 2
-            surface.blit(line_surf, (line_x, y + 55 + j * 22))
+def draw_god_selection_screen(surface, game, mouse_pos, width, height):
+    """Draw the god selection interface"""
+    player = game.current_selection_player
+    god_rects = get_god_card_rects(width)
+    SELECTION_LAYERS.draw(surface, 'god', player, god_rects,
+                          lambda layer, rect, name, hovered: draw_god_card(layer, rect, name, player, hovered),
+                          draw_god_title, mouse_pos, width, height)
 
-    for particle in game.particles:
-        particle.draw(surface)
+    draw_particles(surface, game.particles)
 
     pygame.display.update()
 
@@ -544,45 +582,169 @@ def draw_button(surface, rect, text, base_color, hover_color, mouse_pos, font=FO
     pygame.draw.rect(surface, BLACK, button_rect, 2, border_radius=8)
 
     text_color = DARK_GRAY if disabled else WHITE
-    text_surf = font.render(text, True, text_color)
+    text_surf = TEXT_CACHE.render(font, text, text_color)
     text_rect = text_surf.get_rect(center=button_rect.center)
     surface.blit(text_surf, text_rect)
 
-def draw_shrine_list(surface, game, player, x, y, mouse_pos, panel_width=280):
-    """Draw shrine cards with hover and selection animations"""
+def get_shrine_view(panel):
+    """Return the scrolling card area inside a shrine panel's border, below its label"""
+    return pygame.Rect(panel.x + 3, panel.y + 36, panel.width - 6, panel.height - 39)
+
+def clamp_shrine_scroll(game, player, y, view):
+    """Clamp and store a player's scroll offset for a list starting at y inside view"""
+    max_scroll = max(0, y + len(game.shrine_cards[player]) * SHRINE_ROW_H - view.bottom)
+    scroll = min(max(game.shrine_scroll[player], 0), max_scroll)
+    game.shrine_scroll[player] = scroll
+    return scroll
+
+def scroll_shrine_list(game, player, panel, delta):
+    view = get_shrine_view(panel)
+    clamp_shrine_scroll(game, player, panel.y + 45, view)
+    game.shrine_scroll[player] += delta
+    clamp_shrine_scroll(game, player, panel.y + 45, view)
+
+def get_shrine_rows(game, player, x, y, panel_width=280, view=None):
+    """Return [(index, rect)] for the cards of a player's list that are at least partly inside view.
+
+    Rows sit SHRINE_ROW_H apart from y, shifted up by the player's scroll
+    offset. Only the visible index range is laid out. Without a view every
+    card is returned, unscrolled.
+    """
+    count = len(game.shrine_cards[player])
+    card_width = panel_width - 20
+    if view is None:
+        return [(i, pygame.Rect(x - 5, y + i * SHRINE_ROW_H - 2, card_width, 36)) for i in range(count)]
+
+    scroll = clamp_shrine_scroll(game, player, y, view)
+    first = max(0, (scroll + view.top - y - 34) // SHRINE_ROW_H)
+    last = min(count, (scroll + view.bottom - y + 2) // SHRINE_ROW_H + 1)
+    rows = []
+    for i in range(first, last):
+        rect = pygame.Rect(x - 5, y + i * SHRINE_ROW_H - 2 - scroll, card_width, 36)
+        if rect.colliderect(view):
+            rows.append((i, rect))
+    return rows
+
+def is_card_hovered(card_rect, view, mouse_pos):
+    return card_rect.collidepoint(mouse_pos) and (view is None or view.collidepoint(mouse_pos))
+
+def animate_shrine_list(game, player, rows, mouse_pos, view=None):
+    """Advance the hover and selection animations of a player's visible shrine cards by one frame.
+
+    Cards scrolled out of view, or used, while their hover was still fading
+    stay in game.hover_cards and keep fading, so nothing is left half-raised.
+    """
     cards = game.shrine_cards[player]
-    rects = []
+    active = game.hover_cards[player]
+    visible = set()
+    for i, card_rect in rows:
+        sc = cards[i]
+        visible.add(sc)
+        usable = sc.acquired_turn < game.turn_number
+        if is_card_hovered(card_rect, view, mouse_pos) and usable:
+            sc.hover_scale = min(sc.hover_scale + 0.1, 1.0)
+        else:
+            sc.hover_scale = max(sc.hover_scale - 0.1, 0.0)
+
+        if sc.hover_scale > 0.0:
+            active.add(sc)
+        else:
+            active.discard(sc)
+
+        if game.selected_shrine[player] == i:
+            sc.glow = (sc.glow + 0.1) % (2 * math.pi)
+
+    for sc in [sc for sc in active if sc not in visible]:
+        sc.hover_scale = max(sc.hover_scale - 0.1, 0.0)
+        if sc.hover_scale == 0.0:
+            active.discard(sc)
+
+class ShrineCardSpriteCache:
+    """LRU cache of rendered shrine cards and selection glows.
+
+    A card sprite is keyed by everything that decides its pixels: card name,
+    status text, fill, border and name colours, hover inflation bucket and
+    width. Text positions are kept relative to the unhovered card, as before.
+    """
+
+    def __init__(self, max_sprites=512):
+        self.max_sprites = max_sprites
+        self.sprites = OrderedDict()
+
+    def _cached(self, key, render):
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            return sprite
+        sprite = self.sprites[key] = render()
+        if len(self.sprites) > self.max_sprites:
+            self.sprites.popitem(last=False)
+        return sprite
+
+    def card(self, name, status_text, card_color, border_color, name_color, inflate, card_width):
+        key = ('card', name, status_text, card_color, border_color, name_color, inflate, card_width)
+        return self._cached(key, lambda: self._render_card(*key[1:]))
+
+    def glow(self, size, alpha):
+        def render():
+            glow_surf = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.rect(glow_surf, YELLOW + (alpha,), glow_surf.get_rect(), border_radius=8)
+            return glow_surf
+        return self._cached(('glow', size, alpha), render)
+
+    def _render_card(self, name, status_text, card_color, border_color, name_color, inflate, card_width):
+        sprite = pygame.Surface((card_width + inflate, 36 + inflate), pygame.SRCALPHA)
+        rect = sprite.get_rect()
+        pygame.draw.rect(sprite, card_color, rect, border_radius=8)
+        pygame.draw.rect(sprite, border_color, rect, 2, border_radius=8)
+
+        name_surf = TEXT_CACHE.render(FONT, name, name_color)
+        if name_surf.get_width() > card_width - 50:
+            name_surf = TEXT_CACHE.render(FONT_SMALL, name, name_color)
+        shift = inflate // 2
+        sprite.blit(name_surf, (10 + shift, 6 + shift))
+
+        status_surf = TEXT_CACHE.render(FONT_SMALL, status_text, GREEN if status_text == "✓" else DARK_GRAY)
+        sprite.blit(status_surf, (card_width - status_surf.get_width() - 5 + shift, 20 + shift))
+        return sprite
+
+SHRINE_SPRITES = ShrineCardSpriteCache()
+
+def draw_shrine_list(surface, game, player, x, y, mouse_pos, panel_width=280, animate=True, view=None):
+    """Draw the visible shrine cards of a player with hover and selection animations.
+
+    With a view the list is clipped to it and scrolled by the player's
+    offset; returns the [(index, rect)] rows that were drawn.
+    """
+    cards = game.shrine_cards[player]
+    rows = get_shrine_rows(game, player, x, y, panel_width, view)
 
     if not cards:
         render_text(surface, "(none)", (x, y), font=FONT, color=DARK_GRAY)
-        return rects
+        return rows
+
+    if animate:
+        animate_shrine_list(game, player, rows, mouse_pos, view)
 
     card_width = panel_width - 20
+    border_color = GOLD if GOD_FLAGS[game.god_ids[player]] & ENHANCES_SHRINES else PLAYER_COLORS[player]
 
-    for i, sc in enumerate(cards):
+    clip = surface.get_clip()
+    if view is not None:
+        surface.set_clip(clip.clip(view))
+
+    for i, card_rect in rows:
+        sc = cards[i]
         usable = sc.acquired_turn < game.turn_number
         selected = game.selected_shrine[player] == i
+        is_hovered = usable and is_card_hovered(card_rect, view, mouse_pos)
 
-        card_rect = pygame.Rect(x - 5, y + i * 40 - 2, card_width, 36)
-        rects.append(card_rect)
-
-        is_hovered = card_rect.collidepoint(mouse_pos) and usable
-        if is_hovered:
-            sc.hover_scale = min(sc.hover_scale + 0.1, 1.0)
-        else:
-            sc.hover_scale = max(sc.hover_scale - 0.1, 0.0)
-
-        if selected:
-            sc.glow = (sc.glow + 0.1) % (2 * math.pi)
-
-        expanded_rect = card_rect.copy()
-        expanded_rect.inflate_ip(int(sc.hover_scale * 4), int(sc.hover_scale * 4))
+        inflate = int(sc.hover_scale * 4)
+        expanded_rect = card_rect.inflate(inflate, inflate)
 
         if selected:
             glow_alpha = int(100 + 50 * math.sin(sc.glow))
-            glow_surf = pygame.Surface((expanded_rect.width + 10, expanded_rect.height + 10), pygame.SRCALPHA)
-            glow_color = YELLOW + (glow_alpha,)
-            pygame.draw.rect(glow_surf, glow_color, glow_surf.get_rect(), border_radius=8)
+            glow_surf = SHRINE_SPRITES.glow((expanded_rect.width + 10, expanded_rect.height + 10), glow_alpha)
             surface.blit(glow_surf, (expanded_rect.x - 5, expanded_rect.y - 5))
 
         if usable:
@@ -595,62 +757,141 @@ def draw_shrine_list(surface, game, player, x, y, mouse_pos, panel_width=280):
         else:
             card_color = LIGHT_GRAY
 
-        pygame.draw.rect(surface, card_color, expanded_rect, border_radius=8)
-
-        god = game.selected_gods[player]
-        border_color = GOLD if god == "Demeter" else PLAYER_COLORS[player]
-        pygame.draw.rect(surface, border_color, expanded_rect, 2, border_radius=8)
-
-        name_text = sc.card
-        name_surf = FONT.render(name_text, True, PLAYER_COLORS[player])
-
-        if name_surf.get_width() > card_width - 50:
-            name_surf = FONT_SMALL.render(name_text, True, PLAYER_COLORS[player])
-
-        name_x = x + 5
-        name_y = y + i * 40 + 4
-        surface.blit(name_surf, (name_x, name_y))
+        status_text = "✓" if usable else f"T{sc.acquired_turn}"
+        sprite = SHRINE_SPRITES.card(sc.card, status_text, card_color, border_color, PLAYER_COLORS[player],
+                                     inflate, card_width)
+        surface.blit(sprite, expanded_rect)
+
+    surface.set_clip(clip)
+    return rows
+
+_background_cache = {"size": None, "surface": None}
+
+def get_background(width, height):
+    """Return the vertical background gradient, rebuilt only when the window size changes"""
+    if _background_cache["size"] != (width, height):
+        rows = 240 - (20 * np.arange(height)) // height
+        column = np.stack((rows, rows, rows + 15), axis=-1).astype(np.uint8)
+        pixels = np.broadcast_to(column, (width, height, 3))
+        background = pygame.surfarray.make_surface(pixels)
+        if pygame.display.get_surface() is not None:
+            background = background.convert()
+        _background_cache["size"] = (width, height)
+        _background_cache["surface"] = background
+    return _background_cache["surface"]
+
+def get_playing_layout(width, height):
+    """Calculate the panel rects of the playing screen for the current window size"""
+    header_height = int(height * 0.07)
+    cooldown_y = header_height + 20
+    cooldown_width = min(280, width // 3 - 20)
+    pool_y = cooldown_y + 85
+    shrine_area_y = pool_y + 60
+    shrine_area_height = max(200, height - shrine_area_y - 170)
+    panel_width = min(320, (width - 90) // 2)
 
-        if usable:
-            status_text = "✓"
-            status_color = GREEN
-        else:
-            status_text = f"T{sc.acquired_turn}"
-            status_color = DARK_GRAY
+    return {
+        'header': pygame.Rect(0, 0, width, header_height),
+        'cooldown': {
+            1: pygame.Rect(30, cooldown_y, cooldown_width, 65),
+            2: pygame.Rect(width - cooldown_width - 30, cooldown_y, cooldown_width, 65)
+        },
+        'pool': pygame.Rect(30, pool_y, width - 60, 45),
+        'shrine_panels': {
+            1: pygame.Rect(30, shrine_area_y, panel_width, shrine_area_height),
+            2: pygame.Rect(width - panel_width - 30, shrine_area_y, panel_width, shrine_area_height)
+        },
+        'action': pygame.Rect(30, height - 50, width - 60, 40)
+    }
 
-        status_surf = FONT_SMALL.render(status_text, True, status_color)
-        status_x = x + card_width - status_surf.get_width() - 10
-        status_y = y + i * 40 + 18
-        surface.blit(status_surf, (status_x, status_y))
+ACTION_BUTTONS = {
+    'switch': ("End Turn", BLUE, DARK_BLUE),
+    'god_ability': ("Permanent Blessing", GOLD, (255, 200, 0)),
+    'pick': ("Pick Shrine", ORANGE, (220, 120, 50)),
+    'use': ("Use Shrine", CYAN, (70, 180, 220))
+}
 
-    return rects
+def is_action_disabled(game, name):
+    if name == 'god_ability':
+        return not game.god_ability_ready[game.current_player] or game.game_ended
+    return game.game_ended
 
-def draw_window(surface, game, mouse_pos, width, height):
+class HitRegistry:
+    """Uniform-grid index of the clickable regions on screen.
 
-    buttons = get_button_positions(width, height)
-    menu_buttons = get_menu_button_positions(width, height)
+    Regions are registered once per layout as (rect, target) pairs and filed
+    under every grid cell they overlap, so a point lookup only tests the few
+    rects sharing its cell. Earlier registrations win where regions overlap.
+    """
+    CELL = 64
 
-    for i in range(height):
-        color_value = 240 - int(20 * i / height)
-        color = (color_value, color_value, color_value + 15)
-        pygame.draw.line(surface, color, (0, i), (width, i))
+    def __init__(self):
+        self.key = None
+        self.cells = {}
+
+    def rebuild(self, key, regions):
+        self.key = key
+        self.cells = {}
+        cell = self.CELL
+        for rect, target in regions:
+            if not rect.width or not rect.height:
+                continue
+            for cx in range(rect.left // cell, (rect.right - 1) // cell + 1):
+                for cy in range(rect.top // cell, (rect.bottom - 1) // cell + 1):
+                    self.cells.setdefault((cx, cy), []).append((rect, target))
+
+    def hit(self, pos):
+        """Return the target under pos, or None"""
+        for rect, target in self.cells.get((pos[0] // self.CELL, pos[1] // self.CELL), ()):
+            if rect.collidepoint(pos):
+                return target
+        return None
+
+def update_hit_regions(hits, game, width, height):
+    """Re-register the clickable regions of the current screen if its layout changed"""
+    stage = game.game_stage
+    if stage == "playing":
+        key = (stage, width, height, len(game.shrine_cards[1]), len(game.shrine_cards[2]),
+               game.shrine_scroll[1], game.shrine_scroll[2])
+    else:
+        key = (stage, width, height)
+    if key == hits.key:
+        return
+
+    if stage == "god_selection":
+        regions = [(rect, ("god", name)) for rect, name in get_god_card_rects(width)]
+    elif stage == "apollo_selection":
+        #indexed, since the pool holds every shrine twice
+        regions = [(rect, ("apollo", i)) for i, (rect, name) in enumerate(get_apollo_card_rects(width))]
+    else:
+        regions = [(rect, ("menu", name)) for name, rect in get_menu_button_positions(width, height).items()]
+        regions += [(rect, ("action", name)) for name, rect in get_button_positions(width, height).items()]
+        panels = get_playing_layout(width, height)['shrine_panels']
+        for p in [1, 2]:
+            view = get_shrine_view(panels[p])
+            rows = get_shrine_rows(game, p, panels[p].x + 20, panels[p].y + 45, panels[p].width, view)
+            regions += [(rect.clip(view), ("shrine", p, i)) for i, rect in rows]
+    hits.rebuild(key, regions)
 
+def draw_transition_overlay(surface, game, width, height):
     if game.turn_transition_alpha > 0:
         overlay = pygame.Surface((width, height), pygame.SRCALPHA)
         overlay.fill(PLAYER_COLORS[game.current_player] + (game.turn_transition_alpha,))
         surface.blit(overlay, (0, 0))
 
+def draw_header(surface, game, header_rect, menu_buttons, mouse_pos):
+    """Draw the turn header bar together with the menu buttons sitting on it"""
+    width = header_rect.width
+    header_height = header_rect.height
     player_color = PLAYER_COLORS[game.current_player]
-    header_height = int(height * 0.07)
-    header_rect = pygame.Rect(0, 0, width, header_height)
     pygame.draw.rect(surface, player_color, header_rect)
 
-    header = HUGE.render(f"Turn {game.turn_number}", True, WHITE)
+    header = TEXT_CACHE.render(HUGE, f"Turn {game.turn_number}", WHITE)
     surface.blit(header, (width // 2 - header.get_width() // 2, header_height // 4))
 
     p = game.current_player
     god_name = game.selected_gods[p]
-    player_text = BIG.render(f"P{p}: {god_name}", True, WHITE)
+    player_text = TEXT_CACHE.render(BIG, f"P{p}: {god_name}", WHITE)
     circle_y = header_height // 2
     pygame.draw.circle(surface, WHITE, (60, circle_y), 18)
     pygame.draw.circle(surface, player_color, (60, circle_y), 15)
@@ -658,135 +899,501 @@ def draw_window(surface, game, mouse_pos, width, height):
 
     draw_button(surface, menu_buttons['end_game'], "End Game", RED, DARK_RED, mouse_pos)
     draw_button(surface, menu_buttons['new_game'], "New Game", GREEN, DARK_GREEN, mouse_pos)
-    
-    cooldown_y = header_height + 20
-    cooldown_width = min(280, width // 3 - 20)
 
-    for p in [1, 2]:
-        x_pos = 30 if p == 1 else width - cooldown_width - 30
+def draw_cooldown_panel(surface, game, player, panel):
+    x_pos = panel.x
+    cooldown_y = panel.y
+    cooldown_width = panel.width
 
-        panel = pygame.Rect(x_pos, cooldown_y, cooldown_width, 65)
-        pygame.draw.rect(surface, WHITE, panel, border_radius=8)
-        pygame.draw.rect(surface, PLAYER_COLORS[p], panel, 2, border_radius=8)
+    pygame.draw.rect(surface, WHITE, panel, border_radius=8)
+    pygame.draw.rect(surface, PLAYER_COLORS[player], panel, 2, border_radius=8)
 
-        god = game.selected_gods[p]
-        god_text = FONT.render(f"{god}", True, GOLD)
-        surface.blit(god_text, (x_pos + 10, cooldown_y + 5))
+    god = game.selected_gods[player]
+    god_text = TEXT_CACHE.render(FONT, f"{god}", GOLD)
+    surface.blit(god_text, (x_pos + 10, cooldown_y + 5))
 
-        god_ability_text = "Permanent Blessing"
-        render_text(surface, god_ability_text, (x_pos + 10, cooldown_y + 30), font=FONT_SMALL, color=BLACK)
+    god_ability_text = "Permanent Blessing"
+    render_text(surface, god_ability_text, (x_pos + 10, cooldown_y + 30), font=FONT_SMALL, color=BLACK)
 
-        bar_width = cooldown_width - 20
-        bar_height = 12
-        bar_x = x_pos + 10
-        bar_y = cooldown_y + 47
+    bar_width = cooldown_width - 20
+    bar_height = 12
+    bar_x = x_pos + 10
+    bar_y = cooldown_y + 47
 
-        pygame.draw.rect(surface, LIGHT_GRAY, (bar_x, bar_y, bar_width, bar_height), border_radius=6)
+    pygame.draw.rect(surface, LIGHT_GRAY, (bar_x, bar_y, bar_width, bar_height), border_radius=6)
 
-        if game.god_ability_ready[p]:
-            pygame.draw.rect(surface, GOLD, (bar_x, bar_y, bar_width, bar_height), border_radius=6)
-        else:
-            counter = game.god_ability_counters[p]
-            fill_width = int(bar_width * counter / 3)
-            pygame.draw.rect(surface, ORANGE, (bar_x, bar_y, fill_width, bar_height), border_radius=6)
+    if game.god_ability_ready[player]:
+        pygame.draw.rect(surface, GOLD, (bar_x, bar_y, bar_width, bar_height), border_radius=6)
+    else:
+        counter = game.god_ability_counters[player]
+        fill_width = int(bar_width * counter / GOD_COOLDOWNS[game.god_ids[player]])
+        pygame.draw.rect(surface, ORANGE, (bar_x, bar_y, fill_width, bar_height), border_radius=6)
 
-    pool_y = cooldown_y + 85
-    pool_width = width - 60
-    pool_panel = pygame.Rect(30, pool_y, pool_width, 45)
+def draw_pool_panel(surface, game, pool_panel, width):
+    pool_y = pool_panel.y
     pygame.draw.rect(surface, WHITE, pool_panel, border_radius=8)
     pygame.draw.rect(surface, ORANGE, pool_panel, 2, border_radius=8)
 
-    pool_text = f"Shrine Pool: {len(game.shrine_pool)} cards"
-    render_text(surface, pool_text, (40, pool_y + 12), font=BIG, color=ORANGE)
+    pool_text = f"Shrine Pool: {game.pool_size} cards"
+    render_text(surface, pool_text, (pool_panel.x + 10, pool_y + 12), font=BIG, color=ORANGE)
 
     dot_start_x = width // 2
-    for i in range(min(len(game.shrine_pool), 20)):
+    for i in range(min(game.pool_size, 20)):
         dot_x = dot_start_x + (i % 10) * 25
         dot_y = pool_y + 15 + (i // 10) * 18
         pygame.draw.circle(surface, ORANGE, (dot_x, dot_y), 6)
 
-    draw_button(surface, buttons['switch'], "End Turn", BLUE, DARK_BLUE, mouse_pos, disabled=game.game_ended)
+def draw_action_button(surface, game, name, rect, mouse_pos):
+    text, base_color, hover_color = ACTION_BUTTONS[name]
+    draw_button(surface, rect, text, base_color, hover_color, mouse_pos, disabled=is_action_disabled(game, name))
+
+def draw_shrine_panel(surface, game, player, panel, mouse_pos, animate=True):
+    """Draw a player's shrine panel, its label and card list"""
+    pygame.draw.rect(surface, WHITE, panel, border_radius=10)
+    pygame.draw.rect(surface, PLAYER_COLORS[player], panel, 3, border_radius=10)
+
+    god = game.selected_gods[player]
+    label = TEXT_CACHE.render(BIG, f"P{player}: {god}", PLAYER_COLORS[player])
+    surface.blit(label, (panel.x + 20, panel.y + 10))
+
+    view = get_shrine_view(panel)
+    rows = draw_shrine_list(surface, game, player=player, x=panel.x + 20, y=panel.y + 45, mouse_pos=mouse_pos,
+                            panel_width=panel.width, animate=animate, view=view)
+
+    #scrollbar thumb along the right edge once the hand outgrows the panel
+    content_height = len(game.shrine_cards[player]) * SHRINE_ROW_H
+    list_height = view.bottom - (panel.y + 45)
+    if content_height > list_height:
+        thumb_height = max(20, view.height * list_height // content_height)
+        thumb_y = view.y + (view.height - thumb_height) * game.shrine_scroll[player] // (content_height - list_height)
+        pygame.draw.rect(surface, PLAYER_COLORS[player], (view.right - 6, thumb_y, 4, thumb_height), border_radius=2)
+    return rows
+
+def draw_action_bar(surface, game, action_bg):
+    flash_intensity = int(255 * (game.action_flash / 30))
+    bg_color = (min(255, 200 + flash_intensity // 4), 255, min(255, 200 + flash_intensity // 4))
+    pygame.draw.rect(surface, bg_color, action_bg, border_radius=8)
+    pygame.draw.rect(surface, GREEN, action_bg, 2, border_radius=8)
+    render_text(surface, game.last_action, (action_bg.x + 10, action_bg.y + 10), font=FONT, color=DARK_GREEN)
 
-    p = game.current_player
-    god_ability_disabled = not game.god_ability_ready[p] or game.game_ended
-    draw_button(surface, buttons['god_ability'], "Permanent Blessing", GOLD, (255, 200, 0), mouse_pos, disabled=god_ability_disabled)
+def draw_game_over_overlay(surface, game, width, height):
+    overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+    overlay.fill((0, 0, 0, 180))
+    surface.blit(overlay, (0, 0))
 
-    draw_button(surface, buttons['pick'], "Pick Shrine", ORANGE, (220, 120, 50), mouse_pos, disabled=game.game_ended)
-    draw_button(surface, buttons['use'], "Use Shrine", CYAN, (70, 180, 220), mouse_pos, disabled=game.game_ended)
+    if game.winner:
+        winner_text = TEXT_CACHE.render(HUGE, f"Player {game.winner} Wins!", GOLD)
+        god_text = TEXT_CACHE.render(BIG, f"{game.selected_gods[game.winner]} Triumphs!", PLAYER_COLORS[game.winner])
+    else:
+        winner_text = TEXT_CACHE.render(HUGE, "Game Over!", GOLD)
+        god_text = TEXT_CACHE.render(BIG, "Click 'New Game' to play again", WHITE)
 
-    shrine_area_y = pool_y + 60
-    shrine_area_height = max(200, height - shrine_area_y - 170)
-    panel_width = min(320, (width - 90) // 2)
+    winner_x = width // 2 - winner_text.get_width() // 2
+    winner_y = height // 2 - 60
+    surface.blit(winner_text, (winner_x, winner_y))
+
+    god_x = width // 2 - god_text.get_width() // 2
+    god_y = height // 2 + 10
+    surface.blit(god_text, (god_x, god_y))
 
-    p1_panel = pygame.Rect(30, shrine_area_y, panel_width, shrine_area_height)
-    pygame.draw.rect(surface, WHITE, p1_panel, border_radius=10)
-    pygame.draw.rect(surface, PLAYER_COLORS[1], p1_panel, 3, border_radius=10)
+def draw_window(surface, game, mouse_pos, width, height):
+    section = PROFILER.section
 
-    p2_panel = pygame.Rect(width - panel_width - 30, shrine_area_y, panel_width, shrine_area_height)
-    pygame.draw.rect(surface, WHITE, p2_panel, border_radius=10)
-    pygame.draw.rect(surface, PLAYER_COLORS[2], p2_panel, 3, border_radius=10)
+    buttons = get_button_positions(width, height)
+    menu_buttons = get_menu_button_positions(width, height)
+    layout = get_playing_layout(width, height)
 
-    p1_god = game.selected_gods[1]
-    p1_label = BIG.render(f"P1: {p1_god}", True, PLAYER_COLORS[1])
-    surface.blit(p1_label, (50, shrine_area_y + 10))
+    with section('background'):
+        surface.blit(get_background(width, height), (0, 0))
+    with section('overlay'):
+        draw_transition_overlay(surface, game, width, height)
 
-    p2_god = game.selected_gods[2]
-    p2_label = BIG.render(f"P2: {p2_god}", True, PLAYER_COLORS[2])
-    surface.blit(p2_label, (width - panel_width - 10, shrine_area_y + 10))
+    with section('panels'):
+        draw_header(surface, game, layout['header'], menu_buttons, mouse_pos)
 
-    p1_rects = draw_shrine_list(surface, game, player=1, x=50, y=shrine_area_y + 45, mouse_pos=mouse_pos, panel_width=panel_width)
-    p2_rects = draw_shrine_list(surface, game, player=2, x=width - panel_width - 10, y=shrine_area_y + 45, mouse_pos=mouse_pos, panel_width=panel_width)
+        for p in [1, 2]:
+            draw_cooldown_panel(surface, game, p, layout['cooldown'][p])
 
-    action_y = height - 50
-    action_bg = pygame.Rect(30, action_y, width - 60, 40)
-    flash_intensity = int(255 * (game.action_flash / 30))
-    bg_color = (min(255, 200 + flash_intensity // 4), 255, min(255, 200 + flash_intensity // 4))
-    pygame.draw.rect(surface, bg_color, action_bg, border_radius=8)
-    pygame.draw.rect(surface, GREEN, action_bg, 2, border_radius=8)
-    render_text(surface, game.last_action, (40, action_y + 10), font=FONT, color=DARK_GREEN)
+        draw_pool_panel(surface, game, layout['pool'], width)
 
-    for particle in game.particles:
-        particle.draw(surface)
+    with section('buttons'):
+        for name, rect in buttons.items():
+            draw_action_button(surface, game, name, rect, mouse_pos)
+
+    with section('shrine_lists'):
+        p1_rects = draw_shrine_panel(surface, game, 1, layout['shrine_panels'][1], mouse_pos)
+        p2_rects = draw_shrine_panel(surface, game, 2, layout['shrine_panels'][2], mouse_pos)
+
+    with section('panels'):
+        draw_action_bar(surface, game, layout['action'])
+
+    with section('particles'):
+        draw_particles(surface, game.particles)
 
     # Draw game over overlay if game ended
     if game.game_ended:
-        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        surface.blit(overlay, (0, 0))
+        with section('overlay'):
+            draw_game_over_overlay(surface, game, width, height)
+
+    with section('display_update'):
+        pygame.display.update()
 
-        if game.winner:
-            winner_text = HUGE.render(f"Player {game.winner} Wins!", True, GOLD)
-            god_text = BIG.render(f"{game.selected_gods[game.winner]} Triumphs!", True, PLAYER_COLORS[game.winner])
+    return p1_rects, p2_rects, buttons, menu_buttons
+
+class DirtyRectRenderer:
+    """Retained-mode renderer for the playing screen.
+
+    Every section of the screen is keyed by the state it shows. Sections whose
+    key changed since the last frame are repainted into an offscreen scene, and
+    only those regions plus the particle bounds are pushed to the display.
+    """
+    PARTICLE_MARGIN = 8
+
+    def __init__(self):
+        self.scene = None
+        self.keys = {}
+        self.overlay_state = None
+        self.particle_rect = None
+
+    def invalidate(self):
+        """Force the next frame to repaint and present the whole screen"""
+        self.scene = None
+
+    def _sections(self, game, mouse_pos, width, height, layout, buttons, menu_buttons, shrine_rows):
+        """Return (name, region, key, draw) for every section in paint order"""
+        sections = []
+
+        header = layout['header']
+        header_region = pygame.Rect(0, 0, width, max(header.height, 60))
+        header_key = (game.turn_number, game.current_player, game.selected_gods[game.current_player],
+                      tuple(rect.collidepoint(mouse_pos) for rect in menu_buttons.values()))
+        sections.append(('header', header_region, header_key,
+                         lambda s: draw_header(s, game, header, menu_buttons, mouse_pos)))
+
+        for p in [1, 2]:
+            panel = layout['cooldown'][p]
+            key = (game.selected_gods[p], game.god_ability_ready[p], game.god_ability_counters[p])
+            sections.append((f'cooldown{p}', panel, key,
+                             lambda s, p=p, panel=panel: draw_cooldown_panel(s, game, p, panel)))
+
+        pool = layout['pool']
+        sections.append(('pool', pool.inflate(0, 4), game.pool_size,
+                         lambda s: draw_pool_panel(s, game, pool, width)))
+
+        for name, rect in buttons.items():
+            disabled = is_action_disabled(game, name)
+            key = (disabled, not disabled and rect.collidepoint(mouse_pos))
+            region = pygame.Rect(rect.x, rect.y - 2, rect.width + 3, rect.height + 5)
+            sections.append((name, region, key,
+                             lambda s, name=name, rect=rect: draw_action_button(s, game, name, rect, mouse_pos)))
+
+        for p in [1, 2]:
+            panel = layout['shrine_panels'][p]
+            region = panel.inflate(2, 2)
+            cards = game.shrine_cards[p]
+            key = (game.selected_gods[p], game.selected_shrine[p], len(cards), game.shrine_scroll[p],
+                   tuple((i, cards[i].card, cards[i].acquired_turn < game.turn_number, cards[i].acquired_turn,
+                          cards[i].hover_scale, cards[i].glow, rect.collidepoint(mouse_pos))
+                         for i, rect in shrine_rows[p]))
+            sections.append((f'shrines{p}', region, key,
+                             lambda s, p=p, panel=panel: draw_shrine_panel(s, game, p, panel, mouse_pos, animate=False)))
+
+        action = layout['action']
+        action_region = pygame.Rect(action.x, action.y, width - action.x, action.height)
+        sections.append(('action', action_region, (game.last_action, game.action_flash),
+                         lambda s: draw_action_bar(s, game, action)))
+
+        return sections
+
+    @staticmethod
+    def _phase(name):
+        """Profiler phase a screen section is timed under"""
+        if name.startswith('shrines'):
+            return 'shrine_lists'
+        return 'buttons' if name in ACTION_BUTTONS else 'panels'
+
+    def _particle_bounds(self, particles, width, height):
+        slots = particles.live_slots()
+        if not len(slots):
+            return None
+
+        xs = particles.pos[slots, 0]
+        ys = particles.pos[slots, 1]
+        margin = self.PARTICLE_MARGIN
+        left, top = int(xs.min()) - margin, int(ys.min()) - margin
+        bounds = pygame.Rect(left, top, int(xs.max()) + margin - left, int(ys.max()) + margin - top)
+        bounds = bounds.clip(pygame.Rect(0, 0, width, height))
+        return bounds if bounds.width and bounds.height else None
+
+    def render(self, surface, game, mouse_pos, width, height):
+        """Draw the playing screen, presenting only the regions that changed"""
+        section = PROFILER.section
+        buttons = get_button_positions(width, height)
+        menu_buttons = get_menu_button_positions(width, height)
+        layout = get_playing_layout(width, height)
+        panels = layout['shrine_panels']
+
+        shrine_rows = {}
+        for p in [1, 2]:
+            view = get_shrine_view(panels[p])
+            shrine_rows[p] = get_shrine_rows(game, p, panels[p].x + 20, panels[p].y + 45, panels[p].width, view)
+            animate_shrine_list(game, p, shrine_rows[p], mouse_pos, view)
+
+        sections = self._sections(game, mouse_pos, width, height, layout, buttons, menu_buttons, shrine_rows)
+        background = get_background(width, height)
+
+        overlay_state = (game.turn_transition_alpha, game.current_player, game.game_ended, game.winner)
+        full = (self.scene is None or self.scene.get_size() != (width, height)
+                or overlay_state != self.overlay_state)
+        self.overlay_state = overlay_state
+
+        dirty = []
+        if full:
+            if self.scene is None or self.scene.get_size() != (width, height):
+                self.scene = pygame.Surface((width, height)).convert()
+            with section('background'):
+                self.scene.blit(background, (0, 0))
+            with section('overlay'):
+                draw_transition_overlay(self.scene, game, width, height)
+            for name, region, key, draw in sections:
+                with section(self._phase(name)):
+                    draw(self.scene)
+        else:
+            for name, region, key, draw in sections:
+                if self.keys.get(name) != key:
+                    dirty.append(region)
+
+            for region in dirty:
+                self.scene.set_clip(region)
+                with section('background'):
+                    self.scene.blit(background, region, area=region)
+                with section('overlay'):
+                    draw_transition_overlay(self.scene, game, width, height)
+                for name, other, key, draw in sections:
+                    if other.colliderect(region):
+                        with section(self._phase(name)):
+                            draw(self.scene)
+            self.scene.set_clip(None)
+
+        self.keys = {name: key for name, region, key, draw in sections}
+
+        particle_rect = self._particle_bounds(game.particles, width, height)
+
+        if full or (game.game_ended and (dirty or particle_rect or self.particle_rect)):
+            with section('background'):
+                surface.blit(self.scene, (0, 0))
+            with section('particles'):
+                draw_particles(surface, game.particles)
+            if game.game_ended:
+                with section('overlay'):
+                    draw_game_over_overlay(surface, game, width, height)
+            with section('display_update'):
+                pygame.display.update()
         else:
-            winner_text = HUGE.render("Game Over!", True, GOLD)
-            god_text = BIG.render("Click 'New Game' to play again", True, WHITE)
+            rects = dirty + [rect for rect in (self.particle_rect, particle_rect) if rect]
+            with section('background'):
+                for rect in rects:
+                    surface.blit(self.scene, rect, area=rect)
+            if particle_rect:
+                with section('particles'):
+                    draw_particles(surface, game.particles)
+            if rects:
+                with section('display_update'):
+                    pygame.display.update(rects)
 
-        winner_x = width // 2 - winner_text.get_width() // 2
-        winner_y = height // 2 - 60
-        surface.blit(winner_text, (winner_x, winner_y))
+        self.particle_rect = particle_rect
 
-        god_x = width // 2 - god_text.get_width() // 2
-        god_y = height // 2 + 10
-        surface.blit(god_text, (god_x, god_y))
+        return shrine_rows[1], shrine_rows[2], buttons, menu_buttons
 
-    pygame.display.update()
+class ClickDebouncer:
+    """Per-target click debounce that compares timestamps instead of sleeping.
 
-    return p1_rects, p2_rects, buttons, menu_buttons
+    Clicks act on the MOUSEBUTTONDOWN edge, so holding the button never
+    repeats them.
+    """
+
+    def __init__(self):
+        self.last_accepted = {}
+
+    def accept(self, target, now, debounce_ms):
+        """Return True if a press on target falls outside its debounce window"""
+        last = self.last_accepted.get(target)
+        if last is not None and now - last < debounce_ms:
+            return False
+        self.last_accepted[target] = now
+        return True
+
+class FrameScheduler:
+    """Paces the main loop at FPS while something animates and idles otherwise.
+
+    When idle the loop sleeps until an input event arrives or 1 / IDLE_FPS
+    seconds pass. Natively this blocks in pygame.event.wait; in the browser it
+    polls between short asyncio sleeps so the JS event loop keeps running.
+    Given a HitRegistry, native idle waits swallow pointer motion that stays
+    over the same target as the last frame, since it changes nothing on screen.
+    """
+
+    def __init__(self, fps=FPS, idle_fps=IDLE_FPS):
+        self.fps = fps
+        self.idle_fps = idle_fps
+        self.clock = pygame.time.Clock()
+
+    def is_animating(self, game):
+        if game.particles or game.turn_transition_alpha > 0 or game.action_flash > 0:
+            return True
+
+        if game.game_stage == "playing":
+            for player in [1, 2]:
+                if game.selected_shrine[player] is not None:
+                    return True
+                for sc in game.hover_cards[player]:
+                    if 0.0 < sc.hover_scale < 1.0:
+                        return True
+        return False
+
+    async def wait(self, game, hits=None, hovered=None, busy=False):
+        """Sleep until the next frame is due; busy keeps the full frame rate, e.g. while the AI thinks"""
+        if busy or self.is_animating(game):
+            self.clock.tick(self.fps)
+            await asyncio.sleep(0)
+            return
+
+        timeout = 1.0 / self.idle_fps
+        if RUNNING_IN_BROWSER:
+            step = 1.0 / self.fps
+            waited = 0.0
+            while waited < timeout and not pygame.event.peek():
+                await asyncio.sleep(step)
+                waited += step
+        else:
+            deadline = time.perf_counter() + timeout
+            while True:
+                remaining = int((deadline - time.perf_counter()) * 1000)
+                if remaining <= 0:
+                    break
+                event = pygame.event.wait(remaining)
+                if event.type == pygame.NOEVENT:
+                    break
+                if event.type == pygame.MOUSEMOTION and hits is not None and hits.hit(event.pos) == hovered:
+                    continue
+                pygame.event.post(event)
+                break
+            await asyncio.sleep(0)
+
+        self.clock.tick()
+
+class ProfilerOverlay:
+    """Compact panel showing p50/p95/p99 per profiled phase and a graph of recent frame times.
+
+    Numbers are re-rendered every REFRESH_FRAMES frames rather than through
+    TEXT_CACHE, so changing timings never evict the game's own text.
+    """
+    PHASES = ('frame', 'events', 'update_particles', 'ai', 'selection_screen', 'background', 'panels',
+              'shrine_lists', 'buttons', 'particles', 'overlay', 'display_update', 'log_flush')
+    PANEL_W = 300
+    ROW_H = 16
+    GRAPH_H = 60
+    REFRESH_FRAMES = 15
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.rows = []
+        self.refreshed_at = None
+
+    def _refresh(self):
+        stats = self.profiler.stats()
+        header = ("phase (ms)", "p50", "p95", "p99")
+        self.rows = [[FONT_SMALL.render(text, True, GRAY) for text in header]]
+        for name in self.PHASES:
+            if name in stats:
+                cells = (name,) + tuple(f"{value:.2f}" for value in stats[name])
+                self.rows.append([FONT_SMALL.render(text, True, WHITE) for text in cells])
+        self.refreshed_at = self.profiler.frames
+
+    def draw(self, surface):
+        """Paint the panel in the top-right corner and return the rect it covers"""
+        if self.refreshed_at is None or self.profiler.frames - self.refreshed_at >= self.REFRESH_FRAMES:
+            self._refresh()
+
+        height = 10 + len(self.rows) * self.ROW_H + self.GRAPH_H + 10
+        rect = pygame.Rect(surface.get_width() - self.PANEL_W - 10, 70, self.PANEL_W, height)
+        pygame.draw.rect(surface, BLACK, rect)
+
+        columns = (0, 150, 200, 250)
+        for i, row in enumerate(self.rows):
+            for column, cell in zip(columns, row):
+                surface.blit(cell, (rect.x + 8 + column, rect.y + 8 + i * self.ROW_H))
+
+        #one bar per frame, full height at two frame budgets
+        budget = 1000 / FPS
+        graph_bottom = rect.bottom - 8
+        scale = self.GRAPH_H / (2 * budget)
+        history = self.profiler.history()[-(self.PANEL_W - 16):]
+        for i, ms in enumerate(history):
+            bar = min(self.GRAPH_H, max(1, int(ms * scale)))
+            x = rect.x + 8 + i
+            pygame.draw.line(surface, GREEN if ms <= budget else RED, (x, graph_bottom), (x, graph_bottom - bar))
+        budget_y = graph_bottom - int(budget * scale)
+        pygame.draw.line(surface, YELLOW, (rect.x + 8, budget_y), (rect.right - 8, budget_y))
+        return rect
+
+def run_ai(game, ai):
+    """Let the AI take its seat's selection or its next move; returns True while it is thinking"""
+    if game.game_stage == "god_selection" and game.current_selection_player == ai.player:
+        game.select_god(ai.player, ai.choose_god())
+    elif game.game_stage == "apollo_selection" and game.current_selection_player == ai.player:
+        game.select_apollo_shrine(ai.player, ai.choose_apollo_shrine())
+    elif ai.is_turn(game):
+        ai.think(game)
+        action = ai.poll(AI_SLICE)
+        if action is None:
+            return True
+        ai.play(game, action)
+    return False
+
+def get_ticks():
+    """Milliseconds since startup; pygame.time.get_ticks() reads 0 without pygame.init()"""
+    return int((time.perf_counter() - STARTED_AT) * 1000)
+
+def create_window():
+    """Start only the SDL subsystems the game uses and open the window.
+
+    display.init() also brings up event handling; audio, joystick and the
+    rest of what pygame.init() starts are never touched.
+    """
+    pygame.display.init()
+    pygame.font.init()
+    window = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
+    pygame.display.set_caption("God's Gauntlet - Enhanced")
+    return window
 
 async def main():
     global WIN, WIDTH, HEIGHT
-    clock = pygame.time.Clock()
+    WIN = create_window()
+    scheduler = FrameScheduler()
     game = GameState()
+    renderer = DirtyRectRenderer()
+    debouncer = ClickDebouncer()
+    hits = HitRegistry()
+    profiler_overlay = ProfilerOverlay(PROFILER)
+    section = PROFILER.section
+    first_frame = True
+    ai = None
+    ai_thinking = False
 
     while True:
-        clock.tick(FPS)
+        PROFILER.begin_frame()
         mouse_pos = pygame.mouse.get_pos()
 
-        game.update_particles()
+        with section('update_particles'):
+            game.update_particles()
 
         WIDTH, HEIGHT = WIN.get_size()
 
-        for event in pygame.event.get():
+        with section('events'):
+            events = pygame.event.get()
+
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -795,70 +1402,109 @@ async def main():
                 if event.key == pygame.K_F11:
                     WIN = game.toggle_fullscreen(WIN)
                     WIDTH, HEIGHT = WIN.get_size()
+                    renderer.invalidate()
+                elif event.key == pygame.K_F3:
+                    PROFILER.toggle()
+                    renderer.invalidate()
+                elif event.key == pygame.K_F2:
+                    if ai is None:
+                        ai = AIPlayer(AI_PLAYER, AI_BUDGET, threaded=not RUNNING_IN_BROWSER)
+                        game.last_action = f"Player {AI_PLAYER} is now played by the AI"
+                    else:
+                        ai.cancel()
+                        ai = None
+                        ai_thinking = False
+                        game.last_action = f"Player {AI_PLAYER} is back under manual control"
+                elif event.key == pygame.K_F4 and PROFILER.trace:
+                    count = PROFILER.export_trace(TRACE_PATH)
+                    game.logger.info("Wrote {count} trace events to {path}", count=count, path=TRACE_PATH)
+
+            if event.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                renderer.invalidate()
+
+            if event.type == pygame.MOUSEWHEEL and game.game_stage == "playing":
+                panels = get_playing_layout(WIDTH, HEIGHT)['shrine_panels']
+                pointer = pygame.mouse.get_pos()
+                for p in [1, 2]:
+                    if panels[p].collidepoint(pointer):
+                        scroll_shrine_list(game, p, panels[p], -event.y * SHRINE_ROW_H)
 
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if game.game_stage == "god_selection":
-
-                    god_rects = draw_god_selection_screen(WIN, game, mouse_pos, WIDTH, HEIGHT)
-                    for rect, god_name in god_rects:
-                        if rect.collidepoint(mouse_pos):
-                            game.select_god(game.current_selection_player, god_name)
-                            pygame.time.wait(200)
-                            break
-
-                elif game.game_stage == "apollo_selection":
-
-                    shrine_rects = draw_apollo_selection_screen(WIN, game, mouse_pos, WIDTH, HEIGHT)
-                    for rect, shrine_name in shrine_rects:
-                        if rect.collidepoint(mouse_pos):
-                            game.select_apollo_shrine(game.current_selection_player, shrine_name)
-                            pygame.time.wait(200)
-                            break
-
-                elif game.game_stage == "playing":
-                    buttons = get_button_positions(WIDTH, HEIGHT)
-                    menu_buttons = get_menu_button_positions(WIDTH, HEIGHT)
-
-                    if menu_buttons['end_game'].collidepoint(mouse_pos):
+                now = get_ticks()
+                #the previous event may have changed the screen, so check the layout before every lookup
+                update_hit_regions(hits, game, WIDTH, HEIGHT)
+                target = hits.hit(event.pos)
+                kind = target[0] if target else None
+                #the AI's seat and turn belong to it; only the menu stays clickable
+                if ai is not None and kind != "menu" and (ai.is_turn(game) or (
+                        game.game_stage != "playing" and game.current_selection_player == ai.player)):
+                    kind = None
+
+                if kind == "god":
+                    if debouncer.accept(target, now, SELECTION_DEBOUNCE_MS):
+                        game.select_god(game.current_selection_player, target[1])
+
+                elif kind == "apollo":
+                    if debouncer.accept(target, now, SELECTION_DEBOUNCE_MS):
+                        game.select_apollo_shrine(game.current_selection_player, SHRINE_IDS[target[1]])
+
+                elif kind == "menu":
+                    if target[1] == 'end_game':
                         game.end_game()
-
-                    elif menu_buttons['new_game'].collidepoint(mouse_pos):
+                    else:
+                        if ai is not None:
+                            ai.cancel()
                         game.reset_game()
 
-                    elif not game.game_ended:
-                        if buttons['switch'].collidepoint(mouse_pos):
-                            game.end_turn()
+                elif game.game_ended:
+                    pass
 
-                        elif buttons['god_ability'].collidepoint(mouse_pos):
-                            game.use_god_ability()
+                elif kind == "action":
+                    action = target[1]
+                    if action == 'switch':
+                        game.end_turn()
+                    elif action == 'god_ability':
+                        game.use_god_ability()
+                    elif action == 'pick':
+                        game.pick_shrine()
+                    elif action == 'use':
+                        game.use_shrine_card()
 
-                        elif buttons['pick'].collidepoint(mouse_pos):
-                            game.pick_shrine()
+                elif kind == "shrine":
+                    if debouncer.accept(target, now, SHRINE_DEBOUNCE_MS):
+                        game.select_shrine(target[1], target[2])
 
-                        elif buttons['use'].collidepoint(mouse_pos):
-                            game.use_shrine_card()
+        if ai is not None:
+            with section('ai'):
+                ai_thinking = run_ai(game, ai)
 
         if game.game_stage == "god_selection":
-            draw_god_selection_screen(WIN, game, mouse_pos, WIDTH, HEIGHT)
+            with section('selection_screen'):
+                draw_god_selection_screen(WIN, game, mouse_pos, WIDTH, HEIGHT)
+            renderer.invalidate()
         elif game.game_stage == "apollo_selection":
-            draw_apollo_selection_screen(WIN, game, mouse_pos, WIDTH, HEIGHT)
+            with section('selection_screen'):
+                draw_apollo_selection_screen(WIN, game, mouse_pos, WIDTH, HEIGHT)
+            renderer.invalidate()
+        elif DIRTY_RECT_RENDERING:
+            renderer.render(WIN, game, mouse_pos, WIDTH, HEIGHT)
         else:
-            p1_rects, p2_rects, buttons, menu_buttons = draw_window(WIN, game, mouse_pos, WIDTH, HEIGHT)
-
-            if pygame.mouse.get_pressed()[0] and not game.game_ended:
-                for i, rect in enumerate(p1_rects):
-                    if rect.collidepoint(mouse_pos):
-                        game.select_shrine(1, i)
-                        pygame.time.wait(150)
-                        break
-
-                for i, rect in enumerate(p2_rects):
-                    if rect.collidepoint(mouse_pos):
-                        game.select_shrine(2, i)
-                        pygame.time.wait(150)
-                        break
-
-        await asyncio.sleep(0)
+            draw_window(WIN, game, mouse_pos, WIDTH, HEIGHT)
+
+        if first_frame:
+            game.logger.info("First frame after {startup_ms:.1f} ms", startup_ms=(time.perf_counter() - STARTED_AT) * 1000)
+            first_frame = False
+
+        #write this frame's log records in one batch now that the frame is on screen
+        with section('log_flush'):
+            game.logger.flush()
+
+        if PROFILER.enabled:
+            PROFILER.end_frame()
+            pygame.display.update(profiler_overlay.draw(WIN))
+
+        update_hit_regions(hits, game, WIDTH, HEIGHT)
+        await scheduler.wait(game, hits, hits.hit(mouse_pos), busy=ai_thinking)
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""Opt-in frame profiler for the pygame loop.
+
+Code wraps each phase of a frame in `with profiler.section(name):`. While the
+profiler is disabled, section() returns one shared no-op context, so the
+instrumentation costs a method call per phase. When it is enabled, every
+section adds its duration to the frame's per-phase total and appends a raw
+(name, start, duration) record to a bounded trace buffer. end_frame() then
+pushes the totals into a fixed-size ring per phase. Percentiles are only
+computed when stats() is called, which the overlay does a few times a
+second.
+
+export_trace() writes the trace buffer as Chrome trace event JSON. The file
+can be loaded in chrome://tracing or https://ui.perfetto.dev.
+"""
+import json
+import os
+import time
+from array import array
+from collections import deque
+
+FRAME = "frame"
+
+class _NullSection:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_SECTION = _NullSection()
+
+class _Section:
+    """Reusable timing context for one phase name; phases never nest in themselves"""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.started = 0
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.started, time.perf_counter_ns() - self.started)
+        return False
+
+class FrameProfiler:
+    def __init__(self, window=240, trace_capacity=50000):
+        self.enabled = False
+        self.window = window
+        self.frames = 0
+        #phase -> ring of per-frame totals in milliseconds, oldest overwritten first
+        self.rings = {}
+        self.totals = {}
+        self.sections = {}
+        self.trace = deque(maxlen=trace_capacity)
+        self.origin = time.perf_counter_ns()
+        self.frame_started = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frame_started = None
+        self.totals.clear()
+        return self.enabled
+
+    def section(self, name):
+        if not self.enabled:
+            return NULL_SECTION
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = _Section(self, name)
+        return section
+
+    def record(self, name, started, duration):
+        self.totals[name] = self.totals.get(name, 0) + duration
+        self.trace.append((name, started, duration))
+
+    def begin_frame(self):
+        if self.enabled:
+            self.frame_started = time.perf_counter_ns()
+
+    def end_frame(self):
+        """Close the frame opened by begin_frame and push its phase totals into the rings"""
+        if not self.enabled or self.frame_started is None:
+            return
+        self.record(FRAME, self.frame_started, time.perf_counter_ns() - self.frame_started)
+        self.frame_started = None
+
+        slot = self.frames % self.window
+        for name, duration in self.totals.items():
+            ring = self.rings.get(name)
+            if ring is None:
+                ring = self.rings[name] = array("d", [0.0]) * self.window
+            ring[slot] = duration / 1e6
+        #phases skipped this frame count as zero so every ring stays aligned by frame
+        for name, ring in self.rings.items():
+            if name not in self.totals:
+                ring[slot] = 0.0
+        self.totals.clear()
+        self.frames += 1
+
+    def history(self, name=FRAME):
+        """Per-frame totals for name in milliseconds, oldest first"""
+        ring = self.rings.get(name)
+        if ring is None:
+            return []
+        count = min(self.frames, self.window)
+        start = self.frames % self.window if self.frames >= self.window else 0
+        return [ring[(start + i) % self.window] for i in range(count)]
+
+    def stats(self):
+        """Return {phase: (p50, p95, p99)} in milliseconds over the rolling window"""
+        count = min(self.frames, self.window)
+        if not count:
+            return {}
+        result = {}
+        for name, ring in self.rings.items():
+            values = sorted(ring[:count])
+            result[name] = tuple(values[min(count - 1, int(count * q))] for q in (0.50, 0.95, 0.99))
+        return result
+
+    def export_trace(self, path):
+        """Write the buffered sections as Chrome trace events and return how many were written"""
+        pid = os.getpid()
+        events = [{"name": name, "ph": "X", "ts": (started - self.origin) / 1000, "dur": duration / 1000,
+                   "pid": pid, "tid": 0, "cat": "frame"}
+                  for name, started, duration in self.trace]
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+        return len(events)
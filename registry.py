@@ -0,0 +1,110 @@
+"""Gods and shrine cards, loaded from gods.json.
+
+Gods and card types get small integer IDs in file order. Per-god behaviour
+is kept in lists indexed by ID: an ability kind, a cooldown and a bitmask of
+capability flags. The engine dispatches on these instead of comparing god
+names, so a new god with an existing behaviour is a new entry in the data
+file, not a new branch in the rules.
+
+    ability   "active"  spent on use, recharges after `cooldown` turn ends
+              "clone"   toggles a Hera clone, which lasts `clone_lifetime`
+                        turn ends (0: until despawned)
+              "passive" always on; `blessing` names it in messages
+    flags     sees_next_shrine, chooses_starting_shrine, starting_shrine,
+              enhances_shrines
+
+The shrine pool holds `copies` of every card, laid out as SHRINE_IDS:
+all names once, then again.
+"""
+import json
+import os
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gods.json")
+
+ABILITY_PASSIVE, ABILITY_ACTIVE, ABILITY_CLONE = range(3)
+ABILITY_KINDS = {"passive": ABILITY_PASSIVE, "active": ABILITY_ACTIVE, "clone": ABILITY_CLONE}
+
+SEES_NEXT_SHRINE = 1
+CHOOSES_STARTING_SHRINE = 2
+STARTING_SHRINE = 4
+ENHANCES_SHRINES = 8
+FLAG_NAMES = {
+    "sees_next_shrine": SEES_NEXT_SHRINE,
+    "chooses_starting_shrine": CHOOSES_STARTING_SHRINE,
+    "starting_shrine": STARTING_SHRINE,
+    "enhances_shrines": ENHANCES_SHRINES
+}
+
+#snapshots pack god and card codes into 4 bits and cooldown counters into 3
+MAX_GODS = 15
+MAX_SHRINE_CARDS = 16
+MAX_COOLDOWN = 7
+
+class RegistryError(ValueError):
+    pass
+
+class Registry:
+    """Lookup tables for one data file; every per-god list is indexed by god ID"""
+
+    def __init__(self, data):
+        gods = data.get("gods") or []
+        if not gods or len(gods) > MAX_GODS:
+            raise RegistryError(f"need between 1 and {MAX_GODS} gods, got {len(gods)}")
+
+        self.god_names = []
+        self.descriptions = {}
+        self.abilities = []
+        self.cooldowns = []
+        self.flags = []
+        self.blessings = []
+        self.clone_lifetimes = []
+        for entry in gods:
+            name = entry["name"]
+            if name in self.descriptions:
+                raise RegistryError(f"duplicate god {name}")
+            kind = ABILITY_KINDS.get(entry.get("ability", "passive"))
+            if kind is None:
+                raise RegistryError(f"{name}: unknown ability {entry['ability']!r}")
+            cooldown = entry.get("cooldown", 0)
+            if kind == ABILITY_ACTIVE and not 1 <= cooldown <= MAX_COOLDOWN:
+                raise RegistryError(f"{name}: cooldown must be 1-{MAX_COOLDOWN}, got {cooldown}")
+            clone_lifetime = entry.get("clone_lifetime", 0)
+            if clone_lifetime < 0:
+                raise RegistryError(f"{name}: clone_lifetime must not be negative")
+            flags = 0
+            for flag in entry.get("flags", ()):
+                if flag not in FLAG_NAMES:
+                    raise RegistryError(f"{name}: unknown flag {flag!r}")
+                flags |= FLAG_NAMES[flag]
+
+            self.god_names.append(name)
+            self.descriptions[name] = entry.get("description", "")
+            self.abilities.append(kind)
+            self.cooldowns.append(cooldown)
+            self.flags.append(flags)
+            self.blessings.append(entry.get("blessing", f"{name}'s blessing"))
+            self.clone_lifetimes.append(clone_lifetime)
+        self.god_ids = {name: i for i, name in enumerate(self.god_names)}
+
+        cards = data.get("shrine_cards") or {}
+        self.shrine_names = list(cards.get("names") or [])
+        if not self.shrine_names or len(self.shrine_names) > MAX_SHRINE_CARDS:
+            raise RegistryError(f"need between 1 and {MAX_SHRINE_CARDS} shrine cards, got {len(self.shrine_names)}")
+        if len(set(self.shrine_names)) != len(self.shrine_names):
+            raise RegistryError("duplicate shrine card names")
+        self.shrine_card_ids = {name: i for i, name in enumerate(self.shrine_names)}
+        copies = cards.get("copies", 1)
+        #pool slot -> card name and card ID
+        self.shrine_ids = self.shrine_names * copies
+        self.pool_cards = bytes(self.shrine_card_ids[name] for name in self.shrine_ids)
+        if len(self.shrine_ids) > 255:
+            raise RegistryError("the shrine pool must fit byte indexes")
+
+    def gods_with(self, flag):
+        return [name for name, flags in zip(self.god_names, self.flags) if flags & flag]
+
+def load_registry(path=DATA_PATH):
+    with open(path, encoding="utf-8") as file:
+        return Registry(json.load(file))
+
+REGISTRY = load_registry()
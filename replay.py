@@ -0,0 +1,175 @@
+"""Append-only replay logs with keyframes and deterministic playback.
+
+A log is the magic b"GGRP", a version byte, then length-prefixed records:
+
+    u16 length | u8 kind | payload
+
+EVENT records hold one state-changing command in a few bytes. KEYFRAME
+records hold the turn number and a full binary snapshot (see snapshot.py);
+one is written when recording starts and after every KEYFRAME_INTERVAL
+turns. Rebuilding a turn restores the nearest earlier keyframe and replays
+only the events after it. Refills replay deterministically because the
+keyframe carries the gameplay RNG state, so recorded games must not be fed
+pre-generated refill_orders.
+
+Readers map the file with mmap and copy out one record at a time, so large
+archives can be scanned without loading them into memory.
+"""
+import mmap
+import struct
+
+from engine import GameEngine, AVAILABLE_GODS, SHRINE_NAMES
+from snapshot import encode_snapshot, restore_snapshot, GOD_CODES, SHRINE_CODES
+
+MAGIC = b"GGRP"
+LOG_VERSION = 1
+KEYFRAME_INTERVAL = 10
+
+RECORD_HEADER = struct.Struct("<HB")
+KIND_EVENT = 0
+KIND_KEYFRAME = 1
+
+SELECT_GOD, SELECT_APOLLO, PICK, SELECT_SHRINE, USE, ABILITY, END_TURN, END_GAME = range(8)
+
+#engine events that change gameplay state, mapped to the command that replays them
+EVENT_COMMANDS = {
+    "god_selected": SELECT_GOD,
+    "apollo_shrine_selected": SELECT_APOLLO,
+    "shrine_picked": PICK,
+    "shrine_selected": SELECT_SHRINE,
+    "shrine_used": USE,
+    "ability_used": ABILITY,
+    "clone_spawned": ABILITY,
+    "clone_despawned": ABILITY,
+    "turn_ended": END_TURN,
+    "game_ended": END_GAME
+}
+
+class ReplayError(ValueError):
+    pass
+
+def encode_event(command, data):
+    if command == SELECT_GOD:
+        return bytes((command, data["player"], GOD_CODES[data["god"]]))
+    if command == SELECT_APOLLO:
+        return bytes((command, data["player"], SHRINE_CODES[data["card"]]))
+    if command == SELECT_SHRINE:
+        return bytes((command, data["player"])) + struct.pack("<H", data["index"])
+    if command == END_GAME:
+        return bytes((command, data["winner"] or 0))
+    return bytes((command,))
+
+def apply_event(game, payload):
+    """Re-issue one recorded command against game"""
+    command = payload[0]
+    if command == SELECT_GOD:
+        game.select_god(payload[1], AVAILABLE_GODS[payload[2]])
+    elif command == SELECT_APOLLO:
+        game.select_apollo_shrine(payload[1], SHRINE_NAMES[payload[2]])
+    elif command == PICK:
+        game.pick_shrine()
+    elif command == SELECT_SHRINE:
+        game.select_shrine(payload[1], struct.unpack_from("<H", payload, 2)[0])
+    elif command == USE:
+        game.use_shrine_card()
+    elif command == ABILITY:
+        game.use_god_ability()
+    elif command == END_TURN:
+        game.end_turn()
+    elif command == END_GAME:
+        game.end_game(payload[1] or None)
+    else:
+        raise ReplayError(f"unknown command {command}")
+
+class ReplayRecorder:
+    """Subscribes to a game and appends every state change to a log file"""
+
+    def __init__(self, game, path, keyframe_interval=KEYFRAME_INTERVAL):
+        self.game = game
+        self.keyframe_interval = keyframe_interval
+        self.file = open(path, "wb")
+        self.file.write(MAGIC + bytes((LOG_VERSION,)))
+        self._write(KIND_KEYFRAME, self._keyframe())
+        game.subscribe(self._on_event)
+
+    def _keyframe(self):
+        return struct.pack("<I", self.game.turn_number) + encode_snapshot(self.game)
+
+    def _write(self, kind, payload):
+        self.file.write(RECORD_HEADER.pack(len(payload), kind))
+        self.file.write(payload)
+
+    def _on_event(self, event, data):
+        command = EVENT_COMMANDS.get(event)
+        if command is None or self.file.closed:
+            return
+        self._write(KIND_EVENT, encode_event(command, data))
+        if command == END_TURN and self.game.turn_number % self.keyframe_interval == 0:
+            self._write(KIND_KEYFRAME, self._keyframe())
+
+    def close(self):
+        self.file.close()
+
+class ReplayReader:
+    """Memory-mapped reader with a keyframe index for fast seeking"""
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:4] != MAGIC:
+            raise ReplayError("not a replay log")
+        if self.map[4] != LOG_VERSION:
+            raise ReplayError(f"unsupported log version {self.map[4]}")
+
+        #(turn, offset of the keyframe record) in file order
+        self.keyframes = []
+        for offset, kind, payload in self.records():
+            if kind == KIND_KEYFRAME:
+                self.keyframes.append((struct.unpack_from("<I", payload)[0], offset))
+
+    def records(self, offset=5):
+        """Yield (offset, kind, payload) for every record from offset on, paging the file in lazily"""
+        data = self.map
+        end = len(data)
+        while offset + RECORD_HEADER.size <= end:
+            length, kind = RECORD_HEADER.unpack_from(data, offset)
+            start = offset + RECORD_HEADER.size
+            if start + length > end:
+                break  # torn final record from an interrupted writer
+            yield offset, kind, data[start:start + length]
+            offset = start + length
+
+    def _restore(self, offset):
+        _, _, payload = next(self.records(offset))
+        game = GameEngine(verbose=False)
+        restore_snapshot(game, payload[4:])
+        return game
+
+    def state_at(self, turn):
+        """Rebuild the game as it stood at the end of turn, just before end_turn"""
+        start = self.keyframes[0][1]
+        for keyframe_turn, offset in self.keyframes:
+            if keyframe_turn > turn:
+                break
+            start = offset
+
+        game = self._restore(start)
+        for offset, kind, payload in self.records(start):
+            if kind != KIND_EVENT:
+                continue
+            if game.turn_number >= turn and payload[0] == END_TURN:
+                break
+            apply_event(game, payload)
+        return game
+
+    def play(self):
+        """Replay the whole log from the first keyframe, yielding the game after each event"""
+        game = self._restore(self.keyframes[0][1])
+        for offset, kind, payload in self.records(self.keyframes[0][1]):
+            if kind == KIND_EVENT:
+                apply_event(game, payload)
+                yield game
+
+    def close(self):
+        self.map.close()
+        self.file.close()
@@ -0,0 +1,338 @@
+"""Authoritative asyncio match server for God's Gauntlet.
+
+Each match is one headless GameEngine. Clients speak a line protocol: one
+compact command per line in, one JSON object per line out. A message never
+relies on the stream beyond its own line, so the same frames can be carried
+as WebSocket text messages by a gateway.
+
+Commands (long names are accepted too):
+
+    new                  create a match and take seat 1
+    join <match>         take the free seat in a match
+    g <god>              select_god
+    a <shrine>           select_apollo_shrine
+    p                    pick_shrine
+    s <index>            select_shrine
+    u                    use_shrine_card
+    b                    use_god_ability
+    e                    end_turn
+
+After every accepted command the match broadcasts {"v": version, "d": delta}
+holding only the state fields that changed. The sender gets the same message
+with "ok": 1 added; rejected commands get {"err": reason}.
+
+    python server.py serve --port 8765
+    python server.py bench --matches 500 --turns 20 --idle 10000
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import resource
+import time
+
+from engine import GameEngine, AVAILABLE_GODS, SHRINE_NAMES
+
+COMMAND_ALIASES = {
+    "select_god": "g",
+    "select_apollo_shrine": "a",
+    "pick_shrine": "p",
+    "select_shrine": "s",
+    "use_shrine_card": "u",
+    "use_god_ability": "b",
+    "end_turn": "e"
+}
+
+#commands that only the player whose turn it is may send
+TURN_COMMANDS = {"p", "u", "b", "e"}
+
+def state_dict(game):
+    """Client-visible gameplay state; the pool order stays hidden"""
+    return {
+        "stage": game.game_stage,
+        "chooser": game.current_selection_player,
+        "gods": [game.selected_gods[1], game.selected_gods[2]],
+        "turn": game.turn_number,
+        "player": game.current_player,
+        "ready": [game.god_ability_ready[1], game.god_ability_ready[2]],
+        "cooldown": [game.god_ability_counters[1], game.god_ability_counters[2]],
+        "pool": game.pool_size,
+        "hands": [[[sc.card, sc.acquired_turn] for sc in game.shrine_cards[p]] for p in [1, 2]],
+        "selected": [game.selected_shrine[1], game.selected_shrine[2]],
+        "clones": [game.clones[1] is not None, game.clones[2] is not None],
+        "ended": game.game_ended,
+        "winner": game.winner,
+        "last": game.last_action
+    }
+
+class Match:
+    def __init__(self, match_id):
+        self.id = match_id
+        self.game = GameEngine(verbose=False)
+        self.seats = {1: None, 2: None}
+        self.state = state_dict(self.game)
+        self.version = 0
+
+    def free_seat(self):
+        for seat in [1, 2]:
+            if self.seats[seat] is None:
+                return seat
+        return None
+
+    def delta(self):
+        """Return the fields that changed since the last broadcast and remember the new state"""
+        state = state_dict(self.game)
+        changed = {key: value for key, value in state.items() if self.state[key] != value}
+        self.state = state
+        self.version += 1
+        return changed
+
+class Session:
+    def __init__(self, writer):
+        self.writer = writer
+        self.match = None
+        self.seat = None
+
+    def send(self, message):
+        self.writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+
+class GameServer:
+    def __init__(self):
+        self.matches = {}
+        self.match_ids = itertools.count(1)
+
+    def create_match(self):
+        match = Match(next(self.match_ids))
+        self.matches[match.id] = match
+        return match
+
+    async def handle_client(self, reader, writer):
+        session = Session(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    #longer than the reader's limit; the rest of the stream can't be framed, so hang up
+                    session.send({"err": "line too long"})
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                try:
+                    words = line.decode().split()
+                except UnicodeDecodeError:
+                    session.send({"err": "bad command"})
+                else:
+                    self.dispatch(session, words)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.leave(session)
+            writer.close()
+
+    def leave(self, session):
+        match = session.match
+        if match is None:
+            return
+        match.seats[session.seat] = None
+        if match.seats[1] is None and match.seats[2] is None:
+            del self.matches[match.id]
+        session.match = None
+
+    def seat(self, session, match, seat):
+        session.match = match
+        session.seat = seat
+        match.seats[seat] = session
+        session.send({"ok": 1, "match": match.id, "seat": seat, "v": match.version, "s": match.state})
+
+    def dispatch(self, session, words):
+        if not words:
+            return
+        command = COMMAND_ALIASES.get(words[0], words[0])
+        args = words[1:]
+
+        if command == "new":
+            self.leave(session)
+            self.seat(session, self.create_match(), 1)
+            return
+
+        if command == "join":
+            match = self.matches.get(int(args[0])) if args and args[0].isdigit() else None
+            seat = match.free_seat() if match else None
+            if seat is None:
+                session.send({"err": "no free seat"})
+                return
+            self.leave(session)
+            self.seat(session, match, seat)
+            return
+
+        match = session.match
+        if match is None:
+            session.send({"err": "not in a match"})
+            return
+
+        error = self.apply(match.game, session.seat, command, args)
+        if error:
+            session.send({"err": error})
+            return
+
+        delta = match.delta()
+        message = {"v": match.version, "d": delta}
+        for seat, other in match.seats.items():
+            if other is not None and other is not session:
+                other.send(message)
+        session.send(dict(message, ok=1))
+
+    def apply(self, game, seat, command, args):
+        """Run one command against the engine; return an error string or None"""
+        if game.game_ended:
+            return "game over"
+
+        if command == "g":
+            if game.game_stage != "god_selection" or game.current_selection_player != seat:
+                return "not your selection"
+            if not args or args[0] not in AVAILABLE_GODS:
+                return "unknown god"
+            game.select_god(seat, args[0])
+        elif command == "a":
+            if game.game_stage != "apollo_selection" or game.current_selection_player != seat:
+                return "not your selection"
+            if not args or args[0] not in SHRINE_NAMES:
+                return "unknown shrine"
+            game.select_apollo_shrine(seat, args[0])
+        elif game.game_stage != "playing":
+            return "game not started"
+        elif command == "s":
+            if not args or not args[0].isdigit():
+                return "bad index"
+            game.select_shrine(seat, int(args[0]))
+        elif command in TURN_COMMANDS:
+            if game.current_player != seat:
+                return "not your turn"
+            if command == "p":
+                game.pick_shrine()
+            elif command == "u":
+                game.use_shrine_card()
+            elif command == "b":
+                game.use_god_ability()
+            else:
+                game.end_turn()
+        else:
+            return "unknown command"
+        return None
+
+async def serve(host, port):
+    server = GameServer()
+    listener = await asyncio.start_server(server.handle_client, host, port)
+    print(f"Serving on {', '.join(str(sock.getsockname()) for sock in listener.sockets)}")
+    async with listener:
+        await listener.serve_forever()
+
+class LoadClient:
+    """Loopback client that sends one command at a time and times the reply"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.replies = asyncio.Queue()
+        self.latencies = []
+        self.task = asyncio.ensure_future(self._read())
+
+    async def _read(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            if "ok" in message or "err" in message:
+                self.replies.put_nowait(message)
+
+    async def send(self, command):
+        started = time.perf_counter()
+        self.writer.write(command.encode() + b"\n")
+        reply = await self.replies.get()
+        self.latencies.append(time.perf_counter() - started)
+        return reply
+
+    def close(self):
+        self.task.cancel()
+        self.writer.close()
+
+async def play_loopback_match(host, port, turns, index):
+    clients = [LoadClient(*await asyncio.open_connection(host, port)) for _ in range(2)]
+    first, second = clients
+    created = await first.send("new")
+    await second.send(f"join {created['match']}")
+
+    await first.send(f"g {AVAILABLE_GODS[index % len(AVAILABLE_GODS)]}")
+    await second.send(f"g {AVAILABLE_GODS[(index // len(AVAILABLE_GODS)) % len(AVAILABLE_GODS)]}")
+    for seat in [1, 2]:
+        # Apollo players choose in seat order
+        await clients[seat - 1].send("a Athena")
+
+    for turn in range(turns):
+        player = clients[turn % 2]
+        for command in ("p", "b", "u", "e"):
+            await player.send(command)
+
+    for client in clients:
+        client.close()
+    return [latency for client in clients for latency in client.latencies]
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+async def run_load_test(args):
+    server = GameServer()
+    listener = await asyncio.start_server(server.handle_client, "127.0.0.1", 0)
+    host, port = listener.sockets[0].getsockname()[:2]
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    for _ in range(args.idle):
+        server.create_match()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if args.idle:
+        print(f"{args.idle} idle matches: ~{(rss_after - rss_before) * 1024 / args.idle:.0f} bytes each (max RSS growth)")
+
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited(index):
+        async with semaphore:
+            return await play_loopback_match(host, port, args.turns, index)
+
+    results = await asyncio.gather(*(limited(i) for i in range(args.matches)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for match in results for latency in match)
+    print(f"{args.matches} matches, {len(latencies)} commands in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:.0f} commands/s)")
+    print(f"latency p50 {percentile(latencies, 0.50) * 1000:.3f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.3f} ms, max {latencies[-1] * 1000:.3f} ms")
+
+    listener.close()
+    await listener.wait_closed()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="God's Gauntlet match server")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="run the server")
+    serve_parser.add_argument("--host", default="0.0.0.0")
+    serve_parser.add_argument("--port", type=int, default=8765)
+
+    bench_parser = commands.add_parser("bench", help="measure throughput over loopback")
+    bench_parser.add_argument("--matches", type=int, default=200)
+    bench_parser.add_argument("--turns", type=int, default=20)
+    bench_parser.add_argument("--concurrency", type=int, default=100, help="matches played at once")
+    bench_parser.add_argument("--idle", type=int, default=10000, help="idle matches held during the run")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "serve":
+        asyncio.run(serve(args.host, args.port))
+    else:
+        asyncio.run(run_load_test(args))
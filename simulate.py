@@ -0,0 +1,272 @@
+"""Monte Carlo balance simulator for God's Gauntlet.
+
+Plays seeded games for every (player 1 god, player 2 god) pairing through the
+headless rules engine and streams one row of aggregated statistics per
+pairing to CSV (or JSON lines when the output ends in .jsonl).
+
+    python simulate.py --games 100000 --workers 8 --out balance.csv
+
+The rules have no board, so a match ends when a player reaches the goal;
+that is modelled as a per-turn chance (--end-chance) capped at --max-turns.
+Policies are plain functions policy(game, rng) returning one of ACTIONS and
+can be given by name or as module:function.
+
+--engine batch plays each chunk through the NumPy lockstep engine in
+batch.py instead. It only supports the built-in policies, and its results
+match the scalar engine statistically rather than game for game. Its
+speedup grows with the chunk, so pair it with a larger --chunk-size.
+"""
+import argparse
+import csv
+import importlib
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import (GameEngine, GameRandom, AVAILABLE_GODS, SHRINE_NAMES, GOD_ABILITIES, MAX_ACTIONS_PER_TURN,
+                    ABILITY_ACTIVE, ABILITY_CLONE, permutation_batch)
+
+ACTIONS = ("pick", "select", "use", "ability", "end")
+REFILL_BLOCK = 4096
+
+def usable_indexes(game, player):
+    return [i for i, sc in enumerate(game.shrine_cards[player]) if sc.acquired_turn < game.turn_number]
+
+def ability_worth_using(game, player):
+    kind = GOD_ABILITIES[game.god_ids[player]]
+    if kind == ABILITY_CLONE:
+        return game.clones[player] is None
+    return kind == ABILITY_ACTIVE and game.god_ability_ready[player]
+
+def random_policy(game, rng):
+    return rng.choice(ACTIONS)
+
+def greedy_policy(game, rng):
+    """Use the ability and any usable card as soon as possible, pick one card a turn"""
+    p = game.current_player
+    if ability_worth_using(game, p):
+        return "ability"
+    if usable_indexes(game, p):
+        return "use"
+    if not any(sc.acquired_turn == game.turn_number for sc in game.shrine_cards[p]):
+        return "pick"
+    return "end"
+
+def hoarder_policy(game, rng):
+    """Pick a card every turn and only spend them once the hand holds five"""
+    p = game.current_player
+    if not any(sc.acquired_turn == game.turn_number for sc in game.shrine_cards[p]):
+        return "pick"
+    if len(game.shrine_cards[p]) >= 5 and usable_indexes(game, p):
+        return "use"
+    return "end"
+
+POLICIES = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+    "hoarder": hoarder_policy
+}
+
+def resolve_policy(name):
+    if name in POLICIES:
+        return POLICIES[name]
+    module_name, _, attr = name.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+class MatchStats:
+    """Running totals for one pairing, mergeable across workers"""
+    FIELDS = ("games", "turns", "refills", "cards_picked", "cards_used", "ability_uses", "ready_samples", "turn_samples")
+
+    def __init__(self):
+        self.games = 0
+        self.turns = 0
+        self.refills = 0
+        self.cards_picked = 0
+        #per-player totals, indexed by player number
+        self.cards_used = [0, 0, 0]
+        self.ability_uses = [0, 0, 0]
+        self.ready_samples = [0, 0, 0]
+        self.turn_samples = [0, 0, 0]
+        self.card_uses = {name: 0 for name in SHRINE_NAMES}
+
+    def merge(self, other):
+        for field in self.FIELDS:
+            mine = getattr(self, field)
+            theirs = getattr(other, field)
+            if isinstance(mine, list):
+                for i in range(len(mine)):
+                    mine[i] += theirs[i]
+            else:
+                setattr(self, field, mine + theirs)
+        for name, count in other.card_uses.items():
+            self.card_uses[name] += count
+
+    def row(self, god_1, god_2):
+        games = max(self.games, 1)
+        row = {
+            "god_1": god_1,
+            "god_2": god_2,
+            "games": self.games,
+            "mean_turns": round(self.turns / games, 3),
+            "refills_per_game": round(self.refills / games, 4),
+            "cards_picked_per_game": round(self.cards_picked / games, 3)
+        }
+        for p in [1, 2]:
+            row[f"p{p}_cards_used_per_game"] = round(self.cards_used[p] / games, 3)
+            row[f"p{p}_ability_uses_per_game"] = round(self.ability_uses[p] / games, 3)
+            row[f"p{p}_ability_uptime"] = round(self.ready_samples[p] / max(self.turn_samples[p], 1), 4)
+        for name in SHRINE_NAMES:
+            row[f"used_{name}"] = self.card_uses[name]
+        return row
+
+def refill_stream(seed):
+    """Endless shrine pool orders, generated REFILL_BLOCK at a time"""
+    block = 0
+    while True:
+        yield from permutation_batch([seed, block], REFILL_BLOCK)
+        block += 1
+
+def play_game(god_1, god_2, policies, rng, stats, end_chance, max_turns, refill_orders=None):
+    game = GameEngine(verbose=False, seed=rng.next_u64(), refill_orders=refill_orders)
+
+    def record(event, data):
+        if event == "shrine_used":
+            stats.cards_used[data["player"]] += 1
+            stats.card_uses[data["card"]] += 1
+        elif event in ("ability_used", "clone_spawned"):
+            stats.ability_uses[data["player"]] += 1
+        elif event == "shrine_picked":
+            stats.cards_picked += 1
+        elif event == "pool_refilled":
+            stats.refills += 1
+
+    game.subscribe(record)
+    game.select_god(1, god_1)
+    game.select_god(2, god_2)
+    while game.game_stage == "apollo_selection":
+        game.select_apollo_shrine(game.current_selection_player, rng.choice(SHRINE_NAMES))
+
+    while not game.game_ended:
+        p = game.current_player
+        stats.turn_samples[p] += 1
+        stats.ready_samples[p] += game.god_ability_ready[p]
+
+        policy = policies[p]
+        for _ in range(MAX_ACTIONS_PER_TURN):
+            action = policy(game, rng)
+            if action == "end":
+                break
+            elif action == "pick":
+                game.pick_shrine()
+            elif action == "use":
+                game.use_shrine_card()
+            elif action == "ability":
+                game.use_god_ability()
+            elif action == "select":
+                usable = usable_indexes(game, p)
+                if usable:
+                    game.select_shrine(p, rng.choice(usable))
+
+        game.end_turn()
+        if game.turn_number > max_turns or rng.random() < end_chance:
+            game.end_game()
+
+    stats.games += 1
+    stats.turns += game.turn_number
+
+def run_chunk(task):
+    """Worker entry point: play one seeded chunk of games for a pairing"""
+    pairing, seed, games, policy_names, end_chance, max_turns = task
+    god_1, god_2 = pairing
+    rng = GameRandom(seed)
+    refill_orders = refill_stream(seed)
+    policies = {1: resolve_policy(policy_names[0]), 2: resolve_policy(policy_names[1])}
+
+    stats = MatchStats()
+    for _ in range(games):
+        play_game(god_1, god_2, policies, rng, stats, end_chance, max_turns, refill_orders)
+    return pairing, stats
+
+def make_tasks(args, pairings):
+    for index, pairing in enumerate(pairings):
+        remaining = args.games
+        chunk = 0
+        while remaining > 0:
+            games = min(args.chunk_size, remaining)
+            seed = (args.seed * 1_000_003 + index) * 1_000_003 + chunk
+            yield pairing, seed, games, (args.policy_1, args.policy_2), args.end_chance, args.max_turns
+            remaining -= games
+            chunk += 1
+
+class ResultWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", newline="") if path != "-" else sys.stdout
+        self.jsonl = path.endswith(".jsonl")
+        self.writer = None
+
+    def write(self, row):
+        if self.jsonl:
+            self.file.write(json.dumps(row) + "\n")
+        else:
+            if self.writer is None:
+                self.writer = csv.DictWriter(self.file, fieldnames=list(row))
+                self.writer.writeheader()
+            self.writer.writerow(row)
+        self.file.flush()
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+def simulate(args):
+    gods = args.gods.split(",") if args.gods else AVAILABLE_GODS
+    pairings = list(itertools.product(gods, repeat=2))
+    chunks_per_pairing = -(-args.games // args.chunk_size)
+
+    writer = ResultWriter(args.out)
+    totals = {}
+    pending = {pairing: chunks_per_pairing for pairing in pairings}
+    started = time.perf_counter()
+
+    if args.engine == "batch":
+        import batch
+        unknown = {args.policy_1, args.policy_2} - set(batch.POLICIES)
+        if unknown:
+            sys.exit(f"--engine batch only supports the built-in policies, not {', '.join(sorted(unknown))}")
+        chunk_runner = batch.run_chunk
+    else:
+        chunk_runner = run_chunk
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for pairing, stats in executor.map(chunk_runner, make_tasks(args, pairings), chunksize=4):
+            totals.setdefault(pairing, MatchStats()).merge(stats)
+            pending[pairing] -= 1
+            if not pending[pairing]:
+                writer.write(totals.pop(pairing).row(*pairing))
+
+    writer.close()
+    elapsed = time.perf_counter() - started
+    total_games = args.games * len(pairings)
+    print(f"{total_games} games in {elapsed:.1f}s ({total_games / elapsed:.0f} games/s)", file=sys.stderr)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Batch-simulate God's Gauntlet matchups")
+    parser.add_argument("--games", type=int, default=1000, help="games per pairing")
+    parser.add_argument("--chunk-size", type=int, default=500, help="games per worker task")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--gods", default="", help="comma-separated subset of gods")
+    parser.add_argument("--policy-1", default="greedy", help="policy name or module:function for player 1")
+    parser.add_argument("--policy-2", default="greedy", help="policy name or module:function for player 2")
+    parser.add_argument("--end-chance", type=float, default=0.05, help="chance a match ends after each turn")
+    parser.add_argument("--max-turns", type=int, default=200)
+    parser.add_argument("--engine", choices=["scalar", "batch"], default="scalar",
+                        help="play games one at a time or a chunk at a time with NumPy")
+    parser.add_argument("--out", default="-", help="output .csv or .jsonl path, - for stdout")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    simulate(parse_args())
@@ -0,0 +1,237 @@
+"""Compact binary snapshots and deltas of the gameplay state of a GameEngine.
+
+Only gameplay state is stored; UI fields such as particles, fades and the
+last_action message are left out. Gods and shrine cards are stored as small
+integer codes. A snapshot is a version byte, a kind byte and these groups in
+order:
+
+    HEADER   4 bytes  stage/ended/winner/players, gods, ability state, Apollo queue
+    TURN     varint   turn number
+    RNG      8 bytes  gameplay generator state
+    POOL     varint remaining count, then two shrine codes per byte
+    PLAYER1  varint clone, varint selection, varint hand size, varint per card
+    PLAYER2  same as PLAYER1
+
+Each card is one varint holding acquired_turn << 4 | shrine code, so a typical
+mid-game snapshot is 30-60 bytes. A delta carries a bit mask of the groups that
+changed plus only those groups. Decoding walks a memoryview of the input and
+never copies it.
+"""
+from engine import REGISTRY, AVAILABLE_GODS, SHRINE_IDS, SHRINE_NAMES, GOD_IDS
+
+SNAPSHOT_VERSION = 1
+KIND_SNAPSHOT = 0
+KIND_DELTA = 1
+
+STAGES = ("god_selection", "apollo_selection", "playing")
+#codes are the registry IDs
+GOD_CODES = GOD_IDS
+SHRINE_CODES = REGISTRY.shrine_card_ids
+#pool_order holds SHRINE_IDS indexes; duplicates of a card share one code
+POOL_CODES = REGISTRY.pool_cards
+
+HEADER, TURN, RNG, POOL, PLAYER1, PLAYER2 = range(6)
+GROUP_COUNT = 6
+
+class SnapshotError(ValueError):
+    pass
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varint(view, offset):
+    value = 0
+    shift = 0
+    while True:
+        byte = view[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+def _optional(value):
+    return 0 if value is None else value + 1
+
+def encode_groups(game):
+    """Encode each state group of game to its own bytes object"""
+    if game.player_count != 2:
+        raise SnapshotError("snapshots hold two-player matches only")
+    stage = STAGES.index(game.game_stage)
+    winner = game.winner or 0
+    header = bytes((
+        stage | game.game_ended << 2 | winner << 3 | (game.current_player - 1) << 5 | (game.current_selection_player - 1) << 6,
+        _optional(GOD_CODES.get(game.selected_gods[1])) | _optional(GOD_CODES.get(game.selected_gods[2])) << 4,
+        game.god_ability_ready[1] | game.god_ability_ready[2] << 1 | game.god_ability_counters[1] << 2 | game.god_ability_counters[2] << 5,
+        len(game.apollo_players) | sum((p - 1) << (2 + i) for i, p in enumerate(game.apollo_players))
+    ))
+
+    turn = bytearray()
+    _write_varint(turn, game.turn_number)
+
+    pool = bytearray()
+    remaining = game.pool_order[game.pool_pos:]
+    _write_varint(pool, len(remaining))
+    for i in range(0, len(remaining), 2):
+        low = POOL_CODES[remaining[i]]
+        high = POOL_CODES[remaining[i + 1]] if i + 1 < len(remaining) else 0
+        pool.append(low | high << 4)
+
+    groups = [header, bytes(turn), game.rng.state.to_bytes(8, "little"), bytes(pool)]
+
+    for p in [1, 2]:
+        player = bytearray()
+        clone = game.clones[p]
+        _write_varint(player, _optional(clone))
+        _write_varint(player, _optional(game.selected_shrine[p]))
+        cards = game.shrine_cards[p]
+        _write_varint(player, len(cards))
+        for sc in cards:
+            _write_varint(player, sc.acquired_turn << 4 | SHRINE_CODES[sc.card])
+        groups.append(bytes(player))
+
+    return groups
+
+def encode_snapshot(game):
+    return bytes((SNAPSHOT_VERSION, KIND_SNAPSHOT)) + b"".join(encode_groups(game))
+
+def _check_header(view, kind):
+    if len(view) < 2 or view[0] != SNAPSHOT_VERSION:
+        raise SnapshotError(f"unsupported snapshot version {view[0] if len(view) else None}")
+    if view[1] != kind:
+        raise SnapshotError("expected a delta" if kind == KIND_DELTA else "expected a full snapshot")
+
+def _group_end(view, group, offset):
+    """Return the offset just past the group starting at offset"""
+    if group == HEADER:
+        return offset + 4
+    if group == RNG:
+        return offset + 8
+    if group == TURN:
+        return _read_varint(view, offset)[1]
+    if group == POOL:
+        count, offset = _read_varint(view, offset)
+        return offset + (count + 1) // 2
+    for _ in range(2):
+        offset = _read_varint(view, offset)[1]
+    count, offset = _read_varint(view, offset)
+    for _ in range(count):
+        offset = _read_varint(view, offset)[1]
+    return offset
+
+def split_groups(data, offset=2):
+    """Return memoryview slices of every group in a snapshot without copying"""
+    view = memoryview(data)
+    groups = []
+    for group in range(GROUP_COUNT):
+        end = _group_end(view, group, offset)
+        groups.append(view[offset:end])
+        offset = end
+    return groups
+
+def decode_snapshot(data):
+    """Decode a snapshot into a plain dict of gameplay state; per-player values are lists indexed by player"""
+    view = memoryview(data)
+    _check_header(view, KIND_SNAPSHOT)
+    header, turn, rng, pool, *players = split_groups(view)
+
+    flags, gods, ability, apollo = header
+    remaining, offset = _read_varint(pool, 0)
+    order = bytearray()
+    for byte in pool[offset:]:
+        order.append(byte & 0x0F)
+        order.append(byte >> 4)
+    del order[remaining:]
+
+    state = {
+        "game_stage": STAGES[flags & 0b11],
+        "game_ended": bool(flags >> 2 & 1),
+        "winner": (flags >> 3 & 0b11) or None,
+        "current_player": (flags >> 5 & 1) + 1,
+        "current_selection_player": (flags >> 6 & 1) + 1,
+        "selected_gods": [None, AVAILABLE_GODS[(gods & 0x0F) - 1] if gods & 0x0F else None,
+                          AVAILABLE_GODS[(gods >> 4) - 1] if gods >> 4 else None],
+        "god_ability_ready": [False, bool(ability & 1), bool(ability >> 1 & 1)],
+        "god_ability_counters": [0, ability >> 2 & 0b111, ability >> 5 & 0b111],
+        "apollo_players": [(apollo >> (2 + i) & 1) + 1 for i in range(apollo & 0b11)],
+        "turn_number": _read_varint(turn, 0)[0],
+        "rng_state": int.from_bytes(rng, "little"),
+        "pool": order,
+        "clones": [None, None, None],
+        "selected_shrine": [None, None, None],
+        "shrine_cards": [None, [], []]
+    }
+
+    for p, player in zip([1, 2], players):
+        clone, offset = _read_varint(player, 0)
+        selected, offset = _read_varint(player, offset)
+        count, offset = _read_varint(player, offset)
+        cards = []
+        for _ in range(count):
+            value, offset = _read_varint(player, offset)
+            cards.append((SHRINE_NAMES[value & 0x0F], value >> 4))
+        state["clones"][p] = None if clone == 0 else clone - 1
+        state["selected_shrine"][p] = None if selected == 0 else selected - 1
+        state["shrine_cards"][p] = cards
+
+    return state
+
+def restore_snapshot(game, data):
+    """Overwrite the gameplay state of game with a decoded snapshot, reusing its containers"""
+    state = decode_snapshot(data)
+    for field in ("game_stage", "game_ended", "winner", "current_player", "current_selection_player", "turn_number"):
+        setattr(game, field, state[field])
+    for field in ("selected_gods", "apollo_players", "selected_shrine"):
+        getattr(game, field)[:] = state[field]
+    game.god_ids[:] = [None if god is None else GOD_IDS[god] for god in state["selected_gods"]]
+
+    game.rng.state = state["rng_state"]
+    game.pool_pos = len(SHRINE_IDS) - len(state["pool"])
+    game.pool_order[game.pool_pos:] = state["pool"]
+    for p in [1, 2]:
+        game.shrine_cards[p][:] = [game.card_type(card=card, acquired_turn=turn) for card, turn in state["shrine_cards"][p]]
+    game.restore_timers(state["god_ability_ready"], state["god_ability_counters"], state["clones"])
+    return game
+
+class DeltaEncoder:
+    """Emits only the groups that changed since the previous call"""
+
+    def __init__(self):
+        self.groups = None
+
+    def encode(self, game):
+        """Return a delta against the last encoded state, or a full snapshot the first time"""
+        groups = encode_groups(game)
+        previous = self.groups
+        self.groups = groups
+        if previous is None:
+            return bytes((SNAPSHOT_VERSION, KIND_SNAPSHOT)) + b"".join(groups)
+
+        mask = 0
+        changed = []
+        for i, (old, new) in enumerate(zip(previous, groups)):
+            if old != new:
+                mask |= 1 << i
+                changed.append(new)
+        return bytes((SNAPSHOT_VERSION, KIND_DELTA, mask)) + b"".join(changed)
+
+def apply_delta(snapshot, delta):
+    """Return the full snapshot obtained by applying delta to snapshot"""
+    delta_view = memoryview(delta)
+    if len(delta_view) > 1 and delta_view[1] == KIND_SNAPSHOT:
+        return bytes(delta_view)
+    _check_header(delta_view, KIND_DELTA)
+
+    groups = split_groups(snapshot)
+    mask = delta_view[2]
+    offset = 3
+    for group in range(GROUP_COUNT):
+        if mask >> group & 1:
+            end = _group_end(delta_view, group, offset)
+            groups[group] = delta_view[offset:end]
+            offset = end
+
+    return bytes((SNAPSHOT_VERSION, KIND_SNAPSHOT)) + b"".join(groups)